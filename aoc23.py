@@ -0,0 +1,190 @@
+"""
+runs the dayNN.py solutions from one place
+
+    python aoc23.py                 # every day, both parts, one at a time
+    python aoc23.py 4 5 -j 0        # days 4 and 5 on a process pool (one worker per cpu)
+    python aoc23.py -p 2 --json     # only part 2 of every day, printed as json
+
+each part is timed on its own, wall time and cpu time (cpu time is for the process that ran it)
+"""
+
+import argparse
+import glob
+import importlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import memprofile
+import tracing
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def discoverDays():
+    # find every dayNN.py next to this file, returns a sorted list of day numbers
+    days = []
+    for path in glob.glob(os.path.join(REPO_DIR, "day[0-9][0-9].py")):
+        match = re.match(r"day(\d\d)\.py$", os.path.basename(path))
+        days.append(int(match.group(1)))
+    return sorted(days)
+
+
+def moduleName(day):
+    return "day%02d" % day
+
+
+def loadDay(day):
+    if REPO_DIR not in sys.path:
+        sys.path.insert(0, REPO_DIR)
+    return importlib.import_module(moduleName(day))
+
+
+def inputPath(day, inputDir):
+    return os.path.join(inputDir, moduleName(day) + "_input.txt")
+
+
+def runPart(day, part, inputDir=None, memory=False):
+    # run probN of the given day and time it - errors are reported in the result instead of raised
+    # so one broken day doesnt take down the rest of the run
+    # with memory=True the peak and retained memory of the part are measured too (and it runs slower)
+    result = {"day": day, "part": part, "answer": None,
+              "wall": None, "cpu": None, "error": None}
+    try:
+        solve = getattr(loadDay(day), "prob" + str(part))
+        args = (inputPath(day, inputDir),) if inputDir else ()
+    except (ImportError, AttributeError) as e:
+        result["error"] = repr(e)
+        return result
+
+    wallStart = time.perf_counter()
+    cpuStart = time.process_time()
+    try:
+        with tracing.span("%s.prob%d" % (moduleName(day), part)):
+            if memory:
+                result["answer"], result["memory"] = memprofile.profile(solve, *args)
+            else:
+                result["answer"] = solve(*args)
+    except Exception as e:
+        result["error"] = repr(e)
+    result["cpu"] = time.process_time() - cpuStart
+    result["wall"] = time.perf_counter() - wallStart
+    if tracing.enabled:
+        # hand the events back with the result, they may have been recorded in a worker process
+        result["trace"] = tracing.collect()
+    return result
+
+
+def runAll(tasks, jobs=1, inputDir=None, memory=False):
+    # tasks is a list of (day, part) - returns results in the same order as tasks
+    if jobs == 1:
+        return [runPart(day, part, inputDir, memory) for (day, part) in tasks]
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=jobs or None) as pool:
+        futures = {pool.submit(runPart, day, part, inputDir, memory): (day, part)
+                   for (day, part) in tasks}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return [results[task] for task in tasks]
+
+
+def formatTime(seconds):
+    if seconds is None:
+        return "-"
+    if seconds < 1:
+        return "%.2fms" % (seconds * 1000)
+    return "%.3fs" % seconds
+
+
+def formatTable(results, totalWall, sites=3):
+    memory = any("memory" in r for r in results)
+    rows = [("day", "part", "answer", "wall", "cpu") + (("peak", "retained") if memory else ())]
+    for r in results:
+        answer = ("ERROR " + r["error"]) if r["error"] else str(r["answer"])
+        row = (str(r["day"]), str(r["part"]), answer,
+               formatTime(r["wall"]), formatTime(r["cpu"]))
+        if memory:
+            m = r.get("memory")
+            row += (memprofile.formatBytes(m["peak"]), memprofile.formatBytes(m["retained"])) if m else ("-", "-")
+        rows.append(row)
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = []
+    for row in rows:
+        lines.append("  ".join(col.ljust(w) for col, w in zip(row, widths)).rstrip())
+    lines.append("total wall time: " + formatTime(totalWall))
+
+    # where the biggest allocations came from for each part
+    for r in results:
+        if r.get("memory") and r["memory"]["peakSites"]:
+            lines.append("")
+            lines.append("day %d part %d peak allocations:" % (r["day"], r["part"]))
+            for site, size in r["memory"]["peakSites"][:sites]:
+                lines.append("    %-30s %s" % (site, memprofile.formatBytes(size)))
+    return "\n".join(lines)
+
+
+def getParser():
+    parser = argparse.ArgumentParser(
+        description="run and time the advent of code 2023 solutions")
+    parser.add_argument("days", nargs="*", type=int,
+                        help="days to run (default: every dayNN.py found)")
+    parser.add_argument("-p", "--part", type=int, action="append", choices=[1, 2],
+                        help="part to run, can be given twice (default: both)")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="worker processes, 1 runs serially and 0 uses one per cpu (default: 1)")
+    parser.add_argument("--input-dir",
+                        help="directory holding the dayNN_input.txt files (default: current directory)")
+    parser.add_argument("--json", action="store_true",
+                        help="print results as json instead of a table")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="dont read or write the parsed input cache (see cache.py)")
+    parser.add_argument("--memory", action="store_true",
+                        help="also report peak and retained memory per part, by allocation site (slower)")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="record spans and write them to FILE as chrome trace json (see tracing.py)")
+    return parser
+
+
+def main(argv=None):
+    args = getParser().parse_args(argv)
+    available = discoverDays()
+    days = args.days or available
+    for day in days:
+        if day not in available:
+            print("no solution for day " + str(day), file=sys.stderr)
+            return 2
+    parts = sorted(set(args.part)) if args.part else [1, 2]
+    inputDir = os.path.abspath(args.input_dir) if args.input_dir else os.getcwd()
+    if args.no_cache:
+        # set in the environment so worker processes see it too
+        os.environ["AOC23_CACHE"] = "0"
+    if args.trace:
+        # has to happen before the day modules are imported for @traced to wrap anything
+        tracing.enable()
+
+    tasks = [(day, part) for day in days for part in parts]
+    start = time.perf_counter()
+    results = runAll(tasks, args.jobs, inputDir, args.memory)
+    totalWall = time.perf_counter() - start
+
+    if args.trace:
+        events = []
+        for r in results:
+            events.extend(r.pop("trace", []))
+        tracing.export(args.trace, events)
+
+    if args.json:
+        print(json.dumps({"results": results, "wall": totalWall}, indent=2))
+    else:
+        print(formatTable(results, totalWall))
+
+    return 1 if any(r["error"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+solves one day against a whole pile of input files on a process pool
+
+    python batch.py 4 inputs/day04/              # every file in the directory, both parts
+    python batch.py 4 manifest.txt -p 2 -j 8     # files listed in a manifest (one path per line)
+
+prints one json line per input file as it finishes, then throughput stats on stderr. each worker
+imports the day module once when it starts and then solves files in chunks, so the import and process
+startup cost is paid once per worker instead of once per file
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from aoc23 import loadDay
+
+# set in each worker by initWorker
+_day = None
+_module = None
+
+
+def findInputs(path):
+    # a directory means every file in it, anything else is a manifest with one input path per line
+    # (blank lines and lines starting with # are skipped, relative paths are relative to the manifest)
+    if os.path.isdir(path):
+        return sorted(os.path.join(path, name) for name in os.listdir(path)
+                      if os.path.isfile(os.path.join(path, name)))
+
+    inputs = []
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                inputs.append(os.path.join(base, line))
+    return inputs
+
+
+def initWorker(day):
+    global _day, _module
+    _day = day
+    _module = loadDay(day)
+
+
+def solveFile(task):
+    # task is (path, parts) - returns one result record, errors are reported instead of raised
+    path, parts = task
+    result = {"input": path, "day": _day, "answers": {}, "wall": None, "error": None, "bytes": None}
+    try:
+        result["bytes"] = os.path.getsize(path)
+    except OSError:
+        # missing or unreadable, solving it below reports the error
+        pass
+    start = time.perf_counter()
+    try:
+        for part in parts:
+            result["answers"][part] = getattr(_module, "prob" + str(part))(path)
+    except Exception as e:
+        result["error"] = repr(e)
+    result["wall"] = time.perf_counter() - start
+    return result
+
+
+def runBatch(day, paths, parts=(1, 2), jobs=None, chunksize=None, ordered=False):
+    # yields a result for every path as they finish (in input order if ordered is True)
+    jobs = jobs or os.cpu_count()
+    if chunksize is None:
+        # a few chunks per worker keeps them all busy without sending files over one by one
+        chunksize = max(1, len(paths) // (jobs * 4))
+    tasks = [(path, list(parts)) for path in paths]
+
+    with multiprocessing.Pool(jobs, initializer=initWorker, initargs=(day,)) as pool:
+        run = pool.imap if ordered else pool.imap_unordered
+        for result in run(solveFile, tasks, chunksize):
+            yield result
+
+
+def getParser():
+    parser = argparse.ArgumentParser(description="solve one day against many input files")
+    parser.add_argument("day", type=int, help="day to solve")
+    parser.add_argument("inputs", help="directory of input files, or a manifest file listing them")
+    parser.add_argument("-p", "--part", type=int, action="append", choices=[1, 2],
+                        help="part to run, can be given twice (default: both)")
+    parser.add_argument("-j", "--jobs", type=int, default=0,
+                        help="worker processes (default: one per cpu)")
+    parser.add_argument("--chunksize", type=int,
+                        help="files handed to a worker at a time (default: about 4 chunks per worker)")
+    parser.add_argument("--ordered", action="store_true",
+                        help="print results in input order instead of as they finish")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="dont read or write the parsed input cache (see cache.py)")
+    return parser
+
+
+def main(argv=None):
+    args = getParser().parse_args(argv)
+    if args.no_cache:
+        os.environ["AOC23_CACHE"] = "0"
+    parts = sorted(set(args.part)) if args.part else [1, 2]
+    paths = findInputs(args.inputs)
+
+    start = time.perf_counter()
+    count = errors = totalBytes = 0
+    for result in runBatch(args.day, paths, parts, args.jobs, args.chunksize, args.ordered):
+        print(json.dumps(result), flush=True)
+        count += 1
+        errors += result["error"] is not None
+        totalBytes += result["bytes"] or 0
+    wall = time.perf_counter() - start
+
+    stats = {"files": count, "errors": errors, "bytes": totalBytes, "wall": wall,
+             "filesPerSecond": count / wall if wall else None,
+             "bytesPerSecond": totalBytes / wall if wall else None}
+    print(json.dumps(stats), file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,304 @@
+"""
+benchmarks for every prob1/prob2 and the helpers they spend their time in
+
+    python bench.py                     # run everything, compare against bench_baseline.json if it exists
+    python bench.py -k day05            # only benchmarks with day05 in the name
+    python bench.py --save              # run and store the results as the new baseline
+
+runs offline against the example inputs in examples/ - each benchmark is warmed up, then timed
+'repeat' times and reported as the median and interquartile range of the time per call. exits
+with 1 if any benchmark got slower than the baseline by more than the threshold
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import timeit
+from functools import partial
+
+from aoc23 import REPO_DIR, discoverDays, inputPath, loadDay
+
+EXAMPLES_DIR = os.path.join(REPO_DIR, "examples")
+DEFAULT_BASELINE = os.path.join(REPO_DIR, "bench_baseline.json")
+
+# (day, part) pairs that dont have a working solution yet
+SKIP_PARTS = [(10, 2)]
+
+# benchmarks registered with @benchmark - name -> setup function that returns the callable to time
+benchmarks = {}
+
+
+def benchmark(name):
+    def register(setup):
+        benchmarks[name] = setup
+        return setup
+    return register
+
+
+def examplePath(day, part=None):
+    # a part can have its own example (dayNN_partN_input.txt) when the two parts dont share one
+    if part is not None:
+        path = os.path.join(EXAMPLES_DIR, "day%02d_part%d_input.txt" % (day, part))
+        if os.path.exists(path):
+            return path
+    return inputPath(day, EXAMPLES_DIR)
+
+
+def readLines(day, part=None):
+    with open(examplePath(day, part)) as f:
+        return f.readlines()
+
+
+def registerSolutions():
+    # one benchmark per prob1/prob2 of every day module
+    for day in discoverDays():
+        for part in (1, 2):
+            if (day, part) in SKIP_PARTS:
+                continue
+            name = "day%02d.prob%d" % (day, part)
+            benchmarks[name] = (lambda d, p: lambda: partial(getattr(loadDay(d), "prob" + str(p)),
+                                                             examplePath(d, p)))(day, part)
+
+
+@benchmark("day01.getCalibration")
+def benchGetCalibration():
+    m = loadDay(1)
+    lines = readLines(1)
+    return lambda: [m.getCalibration(line) for line in lines]
+
+
+@benchmark("day01.getTrueCalibration")
+def benchGetTrueCalibration():
+    m = loadDay(1)
+    lines = readLines(1, 2)
+    return lambda: [m.getTrueCalibration(line) for line in lines]
+
+
+@benchmark("day01.bulkCalibration")
+def benchBulkCalibration():
+    m = loadDay(1)
+    with open(examplePath(1), "rb") as f:
+        buffer = f.read()
+    return lambda: m.bulkCalibration(buffer)
+
+
+@benchmark("day01.bulkTrueCalibration")
+def benchBulkTrueCalibration():
+    m = loadDay(1)
+    with open(examplePath(1, 2), "rb") as f:
+        buffer = f.read()
+    return lambda: m.bulkTrueCalibration(buffer)
+
+
+@benchmark("day02.parseGame")
+def benchParseGame():
+    m = loadDay(2)
+    lines = readLines(2)
+    return lambda: [m.parseGame(line) for line in lines]
+
+
+@benchmark("day02.GameStore.query")
+def benchGameStoreQuery():
+    m = loadDay(2)
+    store = m.GameStore.fromSource(examplePath(2))
+    sizes = range(0, 21, 4)
+    bags = [{"red": r, "green": g, "blue": b} for r in sizes for g in sizes for b in sizes]
+    return lambda: store.query(bags)
+
+
+@benchmark("day02.DominanceIndex.query")
+def benchDominanceIndexQuery():
+    m = loadDay(2)
+    index = m.DominanceIndex.fromSource(examplePath(2))
+    sizes = range(0, 21, 4)
+    bags = [{"red": r, "green": g, "blue": b} for r in sizes for g in sizes for b in sizes]
+    return lambda: index.query(bags)
+
+
+@benchmark("day02.Game")
+def benchGame():
+    m = loadDay(2)
+    lines = readLines(2)
+    return lambda: [m.Game(str=line) for line in lines]
+
+
+@benchmark("day03.getSymbolMask")
+def benchGetSymbolMask():
+    m = loadDay(3)
+    schematic = m.getSchematic(examplePath(3))
+    return lambda: m.getSymbolMask(schematic)
+
+
+@benchmark("day03.labelNumbers")
+def benchLabelNumbers():
+    m = loadDay(3)
+    schematic = m.getSchematic(examplePath(3))
+    return lambda: m.labelNumbers(schematic)
+
+
+@benchmark("day03.isPartNumber")
+def benchIsPartNumber():
+    m = loadDay(3)
+    schematic = m.getSchematic(examplePath(3))
+    numbers = [(row, m.getNumbers(schematic[row])) for row in range(len(schematic))]
+
+    def run():
+        for (row, nums) in numbers:
+            for (start, end, num) in nums:
+                m.isPartNumber(start, end, schematic, row)
+    return run
+
+
+@benchmark("day04.Card")
+def benchCard():
+    m = loadDay(4)
+    lines = readLines(4)
+    return lambda: [m.Card(line) for line in lines]
+
+
+@benchmark("day05.Map.transform")
+def benchTransform():
+    m = loadDay(5)
+    seeds, maps = m.readInput(examplePath(5))
+    return lambda: [mp.transform(seed) for mp in maps for seed in seeds]
+
+
+@benchmark("day07.Hand.__lt__")
+def benchHandLt():
+    m = loadDay(7)
+    hands = [m.Hand(line) for line in readLines(7)]
+    return lambda: sorted(hands)
+
+
+@benchmark("day08.getSteps")
+def benchGetSteps():
+    m = loadDay(8)
+    directions, dict = m.getDirectionsDict(examplePath(8))
+    starts = m.endsInA(dict)
+    return lambda: [m.getSteps(start, dict, directions) for start in starts]
+
+
+@benchmark("day09.getNewNum")
+def benchGetNewNum():
+    m = loadDay(9)
+    histories = list(m.getHistories(examplePath(9)))
+    return lambda: [m.getNewNum(h) for h in histories]
+
+
+@benchmark("day10.Grid._getDistances")
+def benchGetDistances():
+    m = loadDay(10)
+    g = m.Grid(examplePath(10))
+    return g._getDistances
+
+
+def measure(func, repeat=7, warmup=2):
+    # time func, returns (median, iqr) of the seconds per call
+    timer = timeit.Timer(func)
+    # pick a number of calls per sample so each sample takes at least 0.2s
+    number, _ = timer.autorange()
+    for _ in range(warmup):
+        timer.timeit(number)
+    samples = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    quartiles = statistics.quantiles(samples, n=4)
+    return statistics.median(samples), quartiles[2] - quartiles[0]
+
+
+def runBenchmarks(names, repeat=7, warmup=2):
+    results = {}
+    for name in names:
+        median, iqr = measure(benchmarks[name](), repeat, warmup)
+        results[name] = {"median": median, "iqr": iqr}
+    return results
+
+
+def loadBaseline(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)["benchmarks"]
+
+
+def saveBaseline(path, results):
+    with open(path, "w") as f:
+        json.dump({"benchmarks": results}, f, indent=2, sort_keys=True)
+
+
+def compare(results, baseline, threshold):
+    # returns a list of (name, ratio) for benchmarks that are slower than the baseline by more than threshold
+    regressions = []
+    for name, r in results.items():
+        if name in baseline:
+            ratio = r["median"] / baseline[name]["median"]
+            if ratio > 1 + threshold:
+                regressions.append((name, ratio))
+    return regressions
+
+
+def formatUs(seconds):
+    return "%.2fus" % (seconds * 1e6)
+
+
+def formatTable(results, baseline):
+    rows = [("benchmark", "median", "iqr", "vs baseline")]
+    for name, r in results.items():
+        change = "-"
+        if name in baseline:
+            change = "%+.1f%%" % ((r["median"] / baseline[name]["median"] - 1) * 100)
+        rows.append((name, formatUs(r["median"]), formatUs(r["iqr"]), change))
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return "\n".join("  ".join(col.ljust(w) for col, w in zip(row, widths)).rstrip() for row in rows)
+
+
+def getParser():
+    parser = argparse.ArgumentParser(description="benchmark the advent of code 2023 solutions")
+    parser.add_argument("-k", dest="filter", default="",
+                        help="only run benchmarks whose name contains this string")
+    parser.add_argument("--repeat", type=int, default=7, help="timed samples per benchmark (default: 7)")
+    parser.add_argument("--warmup", type=int, default=2, help="untimed samples per benchmark (default: 2)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="baseline json file (default: bench_baseline.json)")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown before failing, 0.25 is 25%% (default: 0.25)")
+    parser.add_argument("--save", action="store_true", help="save the results as the new baseline")
+    parser.add_argument("--json", action="store_true", help="print results as json instead of a table")
+    parser.add_argument("--cache", action="store_true",
+                        help="let the solutions use the parsed input cache (off by default so parsing is timed)")
+    return parser
+
+
+def main(argv=None):
+    parser = getParser()
+    args = parser.parse_args(argv)
+    if args.repeat < 2:
+        parser.error("--repeat has to be at least 2 to get an interquartile range")
+    if not args.cache:
+        os.environ["AOC23_CACHE"] = "0"
+    names = sorted(name for name in benchmarks if args.filter in name)
+    results = runBenchmarks(names, args.repeat, args.warmup)
+    baseline = loadBaseline(args.baseline)
+
+    if args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+    else:
+        print(formatTable(results, baseline))
+
+    if args.save:
+        # keep baseline entries for benchmarks that werent run this time
+        baseline.update(results)
+        saveBaseline(args.baseline, baseline)
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for name, ratio in regressions:
+        print("REGRESSION %s is %.2fx slower than baseline" % (name, ratio), file=sys.stderr)
+    return 1 if regressions else 0
+
+
+registerSolutions()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+on-disk cache for parsed puzzle inputs
+
+    @cached("day05.readInput", version=1)
+    def readInput(source):
+        ...
+
+the first time readInput is called with a path, its result is pickled into the cache directory under a key
+made from the hash of the file's contents, the parser's name and its version. later calls with a file
+with the same contents load the pickle instead of parsing again. bump the version whenever the parser
+(or the classes it returns) change shape so old entries stop being used
+
+sources that arent paths (stdin, open files, line iterators) are never cached, they can only be read once.
+neither are parsers of a day run as a script (python day05.py) - pickles of their objects would name
+__main__ as the module, which no other entry point can load, so the module is part of the key and
+__main__ is left out
+
+settings come from environment variables so they carry over into worker processes
+    AOC23_CACHE=0              turn the cache off
+    AOC23_CACHE_DIR            where entries are stored (default: ~/.cache/aoc23)
+    AOC23_CACHE_MAX_BYTES      total size of the cache before the least recently used entries are
+                               deleted (default: 256MB)
+"""
+
+import functools
+import hashlib
+import os
+import pickle
+import tempfile
+
+DEFAULT_DIR = os.path.join(os.path.expanduser("~"), ".cache", "aoc23")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def isEnabled():
+    return os.environ.get("AOC23_CACHE", "1") != "0"
+
+
+def getCacheDir():
+    return os.environ.get("AOC23_CACHE_DIR", DEFAULT_DIR)
+
+
+def getMaxBytes():
+    return int(os.environ.get("AOC23_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+
+
+def hashFile(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def getKey(path, name, version):
+    return hashlib.sha256((hashFile(path) + name + str(version)).encode()).hexdigest()
+
+
+def load(key):
+    # returns (True, value) on a hit, (False, None) on a miss
+    path = os.path.join(getCacheDir(), key + ".pickle")
+    try:
+        with open(path, "rb") as f:
+            value = pickle.load(f)
+    except FileNotFoundError:
+        return False, None
+    except Exception:
+        # unreadable entry (partial write, class moved, ...) - treat it as a miss, it gets overwritten
+        return False, None
+    # bump the modified time, eviction throws out the least recently used entries first
+    try:
+        os.utime(path)
+    except OSError:
+        # another process evicted it since we read it, what we loaded is still good
+        pass
+    return True, value
+
+
+def store(key, value):
+    cacheDir = getCacheDir()
+    os.makedirs(cacheDir, exist_ok=True)
+    # write to a temp file and rename it into place so readers never see half an entry
+    fd, tmpPath = tempfile.mkstemp(dir=cacheDir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmpPath, os.path.join(cacheDir, key + ".pickle"))
+    except Exception:
+        os.unlink(tmpPath)
+        raise
+    evict(getMaxBytes())
+
+
+def evict(maxBytes):
+    # delete least recently used entries until the cache fits in maxBytes
+    cacheDir = getCacheDir()
+    entries = []
+    for name in os.listdir(cacheDir):
+        if name.endswith(".pickle"):
+            stat = os.stat(os.path.join(cacheDir, name))
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+    total = sum(size for (_, size, _) in entries)
+    for (_, size, name) in sorted(entries):
+        if total <= maxBytes:
+            break
+        try:
+            os.unlink(os.path.join(cacheDir, name))
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+def clear():
+    cacheDir = getCacheDir()
+    if os.path.isdir(cacheDir):
+        for name in os.listdir(cacheDir):
+            if name.endswith(".pickle"):
+                os.unlink(os.path.join(cacheDir, name))
+
+
+def cached(name, version):
+    # decorator for parsers that take the input source as their first argument
+    def decorator(parser):
+        @functools.wraps(parser)
+        def wrapper(source, *args, **kwargs):
+            if not (isEnabled() and isinstance(source, (str, os.PathLike)) and source != "-"
+                    and parser.__module__ != "__main__"):
+                return parser(source, *args, **kwargs)
+
+            key = getKey(source, parser.__module__ + ":" + name + repr(args) + repr(sorted(kwargs.items())),
+                         version)
+            hit, value = load(key)
+            if hit:
+                return value
+            value = parser(source, *args, **kwargs)
+            try:
+                store(key, value)
+            except (OSError, pickle.PicklingError):
+                # the cache is only a speedup, a full disk or read-only home shouldnt stop a solve
+                pass
+            return value
+        return wrapper
+    return decorator
@@ -35,12 +35,26 @@ In this example, the calibration values of these four lines are 12, 38, 15, and
 Consider your entire calibration document. What is the sum of all of the calibration values?
 """
 
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 
-def prob1():
+from inputs import readLines
+from tracing import span, traced
+
+try:
+    import numpy as np
+except ImportError:
+    # bulkCalibration falls back to a regex over the buffer without numpy
+    np = None
+
+
+def prob1(source="day01_input.txt"):
     # get calibtration val from each line and add them all up
     total = 0
-    with open("day01_input.txt", "r") as f:
-        for line in f.readlines():
+    with span("day01.prob1.lines"):
+        for line in readLines(source):
             total += getCalibration(line)
     return total
 
@@ -54,6 +68,54 @@ def getCalibration(string):
     return int(string[indices[0]] + string[indices[-1]])
 
 
+# first and last digit of each line, for bulkCalibration without numpy
+LINE_DIGITS = re.compile(rb"^[^\d\n]*(\d)(?:[^\n]*(\d))?", re.MULTILINE)
+
+
+def bulkCalibration(buffer):
+    # part 1 sum for a whole chunk of the document at once (bytes, whole lines only) without making
+    # anything per line - lines without any digit add nothing
+    if np is None:
+        total = 0
+        for (first, last) in LINE_DIGITS.findall(buffer):
+            total += 10 * (first[0] - 48) + ((last or first)[0] - 48)
+        return total
+
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    digitIndices = np.flatnonzero((data >= ord("0")) & (data <= ord("9")))
+    if len(digitIndices) == 0:
+        return 0
+    # line number of every digit = how many newlines come before it
+    lineOf = np.searchsorted(np.flatnonzero(data == ord("\n")), digitIndices)
+    digits = data[digitIndices].astype(np.int64) - ord("0")
+
+    # a digit is the first of its line if the one before it is on another line, and the last if the
+    # one after it is
+    changes = lineOf[1:] != lineOf[:-1]
+    isFirst = np.concatenate(([True], changes))
+    isLast = np.concatenate((changes, [True]))
+    return int(10 * digits[isFirst].sum() + digits[isLast].sum())
+
+
+@traced("day01.prob1Bulk")
+def prob1Bulk(source="day01_input.txt", chunkSize=64 * 1024 * 1024):
+    # prob1 for huge documents - reads the file in chunks of whole lines and sums them with bulkCalibration
+    # so memory stays around chunkSize no matter how big the file is
+    total = 0
+    leftover = b""
+    with open(source, "rb") as f:
+        while True:
+            chunk = f.read(chunkSize)
+            if not chunk:
+                break
+            chunk = leftover + chunk
+            # hold back the partial line at the end for the next chunk
+            end = chunk.rfind(b"\n") + 1
+            leftover = chunk[end:]
+            total += bulkCalibration(chunk[:end])
+    return total + bulkCalibration(leftover)
+
+
 """
 --- Part Two ---
 
@@ -79,17 +141,102 @@ What is the sum of all of the calibration values?
 # just replace so that first/last letters in spelled numbers dont change, so overlaps dont mess up anything
 
 
-def prob2():
+def prob2(source="day01_input.txt"):
     # get calibtration val from each line and add them all up
     total = 0
-    with open("day01_input.txt", "r") as f:
-        for line in f.readlines():
+    with span("day01.prob2.lines"):
+        for line in readLines(source):
             total += getTrueCalibration(line)
     return total
 
 
-# jk doesnt replace in order, will have to go thru one by one
+SPELLED_DIGITS = {"one": "1", "two": "2", "three": "3", "four": "4", "five": "5",
+                  "six": "6", "seven": "7", "eight": "8", "nine": "9"}
+# finds the first digit (real or spelled) from the left
+FIRST_DIGIT = re.compile(r"\d|" + "|".join(SPELLED_DIGITS))
+# same thing run over the reversed line, so it finds the last digit from the right - no spelled digit
+# is inside another one, so the last one to end is also the last one to start
+LAST_DIGIT = re.compile(r"\d|" + "|".join(word[::-1] for word in SPELLED_DIGITS))
+
+
+@traced("day01.getTrueCalibration")
 def getTrueCalibration(string):
+    # one scan from each end, overlaps like 'twone' dont matter since each end only needs its own match
+    first = FIRST_DIGIT.search(string).group()
+    last = LAST_DIGIT.search(string[::-1]).group()[::-1]
+    return int(SPELLED_DIGITS.get(first, first) + SPELLED_DIGITS.get(last, last))
+
+
+# first and last digit (real or spelled) of each line of a bytes buffer, for bulkTrueCalibration.
+# the lazy one stops at the first match on the line, the greedy one backs up from the end to the last
+BYTES_DIGITS = rb"\d|" + "|".join(SPELLED_DIGITS).encode()
+LINE_FIRST_TRUE = re.compile(rb"^[^\n]*?(" + BYTES_DIGITS + rb")", re.MULTILINE)
+LINE_LAST_TRUE = re.compile(rb"^[^\n]*(" + BYTES_DIGITS + rb")", re.MULTILINE)
+BYTES_VALUES = {word.encode(): int(digit) for word, digit in SPELLED_DIGITS.items()}
+BYTES_VALUES.update({digit.encode(): int(digit) for digit in SPELLED_DIGITS.values()})
+
+
+def bulkTrueCalibration(buffer):
+    # part 2 sum for a bytes buffer of whole lines - both patterns match on exactly the lines that have a
+    # digit, so the firsts and lasts line up
+    firsts = LINE_FIRST_TRUE.findall(buffer)
+    lasts = LINE_LAST_TRUE.findall(buffer)
+    return 10 * sum(BYTES_VALUES[f] for f in firsts) + sum(BYTES_VALUES[l] for l in lasts)
+
+
+def getShards(size, count, findNewline):
+    # split [0, size) into about count byte ranges that each start right after a newline
+    # findNewline(pos) returns the index of the first newline at or after pos (or -1)
+    bounds = [0]
+    for i in range(1, count):
+        newline = findNewline(max(size * i // count, bounds[-1]))
+        if newline == -1:
+            break
+        if newline + 1 > bounds[-1]:
+            bounds.append(newline + 1)
+    if bounds[-1] < size:
+        bounds.append(size)
+    return [(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1) if bounds[i] < bounds[i + 1]]
+
+
+def calibrateShard(path, start, end, pieceSize=16 * 1024 * 1024):
+    # (part 1 sum, part 2 sum) for the lines in bytes [start, end) of the file - the file is memory mapped
+    # and handled pieceSize bytes (rounded to whole lines) at a time, so memory stays bounded
+    part1 = part2 = 0
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        while start < end:
+            stop = min(start + pieceSize, end)
+            if stop < end:
+                newline = mm.find(b"\n", stop, end)
+                stop = end if newline == -1 else newline + 1
+            piece = mm[start:stop]
+            part1 += bulkCalibration(piece)
+            part2 += bulkTrueCalibration(piece)
+            start = stop
+    return part1, part2
+
+
+def shardedCalibration(source="day01_input.txt", workers=None, shards=None):
+    # (part 1, part 2) for a calibration document of any size - it gets split into newline aligned shards
+    # that worker processes sum up on their own, then the partial sums are added together
+    size = os.path.getsize(source)
+    if size == 0:
+        return 0, 0
+    workers = workers or os.cpu_count()
+    with open(source, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # a few shards per worker so one slow shard doesnt hold everything up
+        ranges = getShards(size, shards or workers * 4, lambda pos: mm.find(b"\n", pos))
+
+    paths = [source] * len(ranges)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        partials = list(pool.map(calibrateShard, paths, [s for (s, _) in ranges], [e for (_, e) in ranges]))
+    return sum(p for (p, _) in partials), sum(p for (_, p) in partials)
+
+
+# first version, rewrites the line one index at a time - recursion means it cant handle lines longer
+# than the recursion limit. kept as the reference for differential.py
+# jk doesnt replace in order, will have to go thru one by one
+def getReplacedCalibration(string):
     string = spelledToRealDigits(string, 0)
     return getCalibration(string)
 
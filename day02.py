@@ -42,15 +42,25 @@ Determine which games would have been possible if the bag had been loaded with o
 and 14 blue cubes. What is the sum of the IDs of those games?
 """
 
+import os
+import time
+from bisect import bisect_right
 
-def prob1():
-    possible = Game(red=12, green=13, blue=14)
-    with open("day02_input.txt") as f:
-        lines = f.readlines()
-        gameTotal = 0
-        for line in lines:
-            game = Game(str=line)
-            if (game.isPossible(possible)):
+from inputs import readLines
+from tracing import span, traced
+
+try:
+    import numpy as np
+except ImportError:
+    # GameStore keeps plain lists and answers bags one at a time without numpy
+    np = None
+
+
+def prob1(source="day02_input.txt"):
+    gameTotal = 0
+    with span("day02.prob1.games"):
+        for game in readGames(source):
+            if (game.fits(BAG)):
                 gameTotal += game.id
 
     return gameTotal
@@ -58,6 +68,7 @@ def prob1():
 
 class Game:
 
+    @traced("day02.Game")
     def __init__(self, str=None, red=None, blue=None, green=None):
         # can have str OR red/green/blue, not both
         if (str):
@@ -102,6 +113,270 @@ class Game:
         return "Game " + str(self.id) + ":\n\tred: " + str(self.red) + "\n\tblue:" + str(self.blue) + "\n\tgreen: " + str(self.green)
 
 
+# the bag from part 1 and the colors the power is taken over in part 2
+BAG = {"red": 12, "green": 13, "blue": 14}
+COLORS = ("red", "green", "blue")
+
+
+class GameRecord:
+    # what one parse of a game line leaves behind - the id and the most cubes of each color shown at once
+    # Game splits the line again for every color, this reads it once and works for any set of colors
+    __slots__ = ("id", "maxima")
+
+    def __init__(self, id, maxima):
+        self.id = id
+        self.maxima = maxima  # color -> max
+
+    def fits(self, bag):
+        # bag is color -> cubes, a color thats not in the bag has none
+        for color, count in self.maxima.items():
+            if count > bag.get(color, 0):
+                return False
+        return True
+
+    def power(self, colors=COLORS):
+        # product of the maxima of colors (every color seen if None), a missing color makes it 0
+        power = 1
+        for color in (self.maxima if colors is None else colors):
+            power *= self.maxima.get(color, 0)
+        return power
+
+    def __repr__(self):
+        return "GameRecord(%d, %r)" % (self.id, self.maxima)
+
+
+@traced("day02.parseGame")
+def parseGame(line):
+    # "Game 12: 3 blue, 4 red; 1 red, 2 green" -> GameRecord(12, {"blue": 3, "red": 4, "green": 2})
+    header, _, draws = line.partition(":")
+    maxima = {}
+    for draw in draws.replace(";", ",").split(","):
+        count, color = draw.split()
+        count = int(count)
+        if count > maxima.get(color, 0):
+            maxima[color] = count
+    return GameRecord(int(header.split()[1]), maxima)
+
+
+def readGames(source):
+    for line in readLines(source):
+        if line.strip():
+            yield parseGame(line)
+
+
+class GameStore:
+    # every game's maxima kept by column (one row per color) so lots of bags can be checked against the
+    # same games without parsing them again
+
+    # bags x games booleans made at a time while answering queries
+    QUERY_CELLS = 1 << 24
+
+    def __init__(self, games, colors=None):
+        # games is any iterable of GameRecords, colors fixes the columns (default: every color seen,
+        # in the order they first show up)
+        self.colors = list(colors or [])
+        columns = {color: [] for color in self.colors}
+        ids = []
+        powers = []
+        for game in games:
+            for color in game.maxima:
+                if color not in columns:
+                    if colors is not None:
+                        raise ValueError("game %d has %s cubes, which isnt one of %r"
+                                         % (game.id, color, colors))
+                    # new color, all the games before this one had none of it
+                    columns[color] = [0] * len(ids)
+                    self.colors.append(color)
+            for color in self.colors:
+                columns[color].append(game.maxima.get(color, 0))
+            ids.append(game.id)
+            powers.append(game.power())
+
+        if np is not None:
+            self.ids = np.array(ids, dtype=np.int64)
+            self.powers = np.array(powers, dtype=np.int64)
+            self.maxima = np.array([columns[color] for color in self.colors], dtype=np.int64)
+            self.maxima = self.maxima.reshape(len(self.colors), len(ids))
+        else:
+            self.ids = ids
+            self.powers = powers
+            self.maxima = [columns[color] for color in self.colors]
+
+    @classmethod
+    def fromSource(cls, source="day02_input.txt", colors=None):
+        return cls(readGames(source), colors)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def powerTotal(self):
+        return int(sum(self.powers))
+
+    def _bagRows(self, bags):
+        # each bag as the max it allows per column, colors the bag doesnt mention allow none
+        return [[bag.get(color, 0) for color in self.colors] for bag in bags]
+
+    @traced("day02.GameStore.query")
+    def query(self, bags):
+        # for each bag (color -> cubes) returns (sum of ids, count) of the games it could have been
+        rows = self._bagRows(bags)
+        if np is None:
+            return [self._queryOne(row) for row in rows]
+
+        results = []
+        step = max(1, self.QUERY_CELLS // max(1, len(self)))
+        for start in range(0, len(rows), step):
+            chunk = rows[start:start + step]
+            limits = np.array(chunk, dtype=np.int64).reshape(len(chunk), len(self.colors))
+            fits = np.ones((len(limits), len(self)), dtype=bool)
+            for c in range(len(self.colors)):
+                fits &= self.maxima[c][None, :] <= limits[:, c][:, None]
+            idSums = fits @ self.ids
+            counts = fits.sum(axis=1)
+            results += [(int(s), int(n)) for (s, n) in zip(idSums, counts)]
+        return results
+
+    def _queryOne(self, row):
+        idSum = count = 0
+        for g in range(len(self.ids)):
+            for c in range(len(row)):
+                if self.maxima[c][g] > row[c]:
+                    break
+            else:
+                idSum += self.ids[g]
+                count += 1
+        return idSum, count
+
+
+class DominanceIndex:
+    # answers the same bag queries as GameStore.query without looking at every game. a game fits a bag
+    # when it is dominated by it in every color, so this counts dominated points
+    #
+    # cube counts only take a handful of distinct values, so usually every combination of them fits in
+    # a prefix sum grid and a query is a binary search per color plus one lookup. when there are too
+    # many combinations and at most RANGE_TREE_COLORS colors it builds a layered range tree instead,
+    # O(log^colors n) per query but O(n log^(colors-1) n) time and memory to build. past that the tree
+    # costs more to build than it saves, so it just scans the store like GameStore.query
+
+    GRID_CELLS = 1 << 20
+    RANGE_TREE_COLORS = 3
+
+    def __init__(self, store):
+        self.colors = list(store.colors)
+        self.store = None
+        columns = [[int(n) for n in column] for column in store.maxima]
+        ids = [int(i) for i in store.ids]
+        values = [sorted(set(column)) for column in columns]
+        cells = 1
+        for v in values:
+            cells *= len(v)
+        if cells <= self.GRID_CELLS or not values:
+            self.lookup = PrefixGrid(values, columns, ids)
+        elif len(self.colors) <= self.RANGE_TREE_COLORS:
+            self.lookup = RangeTree(list(zip(*columns)), ids, len(self.colors))
+        else:
+            self.lookup = None
+            self.store = store
+
+    @classmethod
+    def fromSource(cls, source="day02_input.txt", colors=None):
+        return cls(GameStore.fromSource(source, colors))
+
+    def queryOne(self, bag):
+        if self.store is not None:
+            return self.store.query([bag])[0]
+        return self.lookup.query([bag.get(color, 0) for color in self.colors])
+
+    @traced("day02.DominanceIndex.query")
+    def query(self, bags):
+        if self.store is not None:
+            return self.store.query(bags)
+        return [self.queryOne(bag) for bag in bags]
+
+
+class PrefixGrid:
+    # (id sum, count) of the games at or below every combination of distinct values, one axis per color
+
+    def __init__(self, values, columns, ids):
+        self.values = values
+        self.strides = []
+        size = 1
+        for v in reversed(values):
+            self.strides.insert(0, size)
+            size *= len(v)
+
+        sums = [0] * size
+        counts = [0] * size
+        for g in range(len(ids)):
+            cell = 0
+            for c in range(len(values)):
+                cell += (bisect_right(values[c], columns[c][g]) - 1) * self.strides[c]
+            sums[cell] += ids[g]
+            counts[cell] += 1
+
+        # running totals along each axis in turn turn the cells into prefix sums
+        if np is not None and values:
+            shape = [len(v) for v in values]
+            sums = np.array(sums, dtype=np.int64).reshape(shape)
+            counts = np.array(counts, dtype=np.int64).reshape(shape)
+            for axis in range(len(shape)):
+                sums, counts = sums.cumsum(axis), counts.cumsum(axis)
+            sums, counts = sums.ravel().tolist(), counts.ravel().tolist()
+        else:
+            for c in range(len(values)):
+                stride, length = self.strides[c], len(values[c])
+                for cell in range(size):
+                    if (cell // stride) % length:
+                        sums[cell] += sums[cell - stride]
+                        counts[cell] += counts[cell - stride]
+        self.sums = sums
+        self.counts = counts
+
+    def query(self, limits):
+        cell = 0
+        for c in range(len(self.values)):
+            k = bisect_right(self.values[c], limits[c]) - 1
+            if k < 0:
+                # below every game in this color
+                return 0, 0
+            cell += k * self.strides[c]
+        return self.sums[cell], self.counts[cell]
+
+
+class RangeTree:
+    # layered range tree for (id sum, count) of points dominated by a query point. points are sorted by
+    # their first coordinate and a fenwick tree over that order keeps, in each node, a tree of the rest
+    # of the coordinates of the points it covers. the last coordinate is a sorted list with prefix sums
+    # building it takes O(n log^(dims-1) n) time and memory, so keep dims small
+
+    def __init__(self, points, weights, dims):
+        order = sorted(range(len(points)), key=lambda i: points[i][0])
+        self.keys = [points[i][0] for i in order]
+        self.last = dims == 1
+        if self.last:
+            self.sums = [0]
+            for i in order:
+                self.sums.append(self.sums[-1] + weights[i])
+        else:
+            self.nodes = [None]
+            for node in range(1, len(order) + 1):
+                covered = order[node - (node & -node):node]
+                self.nodes.append(RangeTree([points[i][1:] for i in covered], [weights[i] for i in covered],
+                                            dims - 1))
+
+    def query(self, limits):
+        k = bisect_right(self.keys, limits[0])
+        if self.last:
+            return self.sums[k], k
+        idSum = count = 0
+        while k:
+            s, n = self.nodes[k].query(limits[1:])
+            idSum += s
+            count += n
+            k -= k & -k
+        return idSum, count
+
+
 """
 --- Part Two ---
 
@@ -146,16 +421,95 @@ class NewGame(Game):
         return self.red * self.blue * self.green
 
 
-def prob2():
+def prob2(source="day02_input.txt"):
     total = 0
-    with open("day02_input.txt") as f:
-        for line in f.readlines():
-            game = NewGame(line)
-            total += game.power
+    with span("day02.prob2.games"):
+        for game in readGames(source):
+            total += game.power()
 
     return total
 
 
+def solveGames(source="day02_input.txt", bag=BAG, colors=COLORS):
+    # both parts from a single parse - (sum of ids of games that fit the bag, sum of powers)
+    idTotal = powerTotal = 0
+    with span("day02.solveGames"):
+        for game in readGames(source):
+            if game.fits(bag):
+                idTotal += game.id
+            powerTotal += game.power(colors)
+
+    return idTotal, powerTotal
+
+
+class GameLogFollower:
+    # keeps both answers up to date for a game log that keeps getting appended to, each poll() only
+    # parses the bytes added since the last one. a line without its newline yet waits for the next poll,
+    # and if the file shrinks, gets replaced or gets rewritten in place it starts over from the top
+
+    # bytes just before the offset kept to notice a file that was truncated and grew back past the offset
+    # between polls (copy-truncate log rotation keeps the inode)
+    TAIL_BYTES = 64
+
+    def __init__(self, path, bag=BAG, colors=COLORS):
+        self.path = path
+        self.bag = bag
+        self.colors = colors
+        self.reset()
+
+    def reset(self):
+        self.offset = 0
+        self.partial = b""
+        self.tail = b""
+        self.inode = None
+        self.idTotal = 0
+        self.powerTotal = 0
+        self.games = 0
+
+    def poll(self):
+        # reads whatever was appended, returns (sum of ids that fit the bag, sum of powers)
+        with open(self.path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            restarted = stat.st_ino != self.inode or stat.st_size < self.offset
+            if not restarted and self.tail:
+                f.seek(self.offset - len(self.tail))
+                restarted = f.read(len(self.tail)) != self.tail
+            if restarted:
+                # first poll, truncated, rotated to a new file, or rewritten under us
+                self.reset()
+                self.inode = stat.st_ino
+            f.seek(self.offset)
+            data = f.read(stat.st_size - self.offset)
+        self.offset += len(data)
+        self.tail = (self.tail + data)[-self.TAIL_BYTES:]
+
+        lines = (self.partial + data).split(b"\n")
+        self.partial = lines.pop()
+        with span("day02.GameLogFollower.poll"):
+            for line in lines:
+                if line.strip():
+                    self.add(parseGame(line.decode()))
+        return self.idTotal, self.powerTotal
+
+    def add(self, game):
+        if game.fits(self.bag):
+            self.idTotal += game.id
+        self.powerTotal += game.power(self.colors)
+        self.games += 1
+
+
+def follow(path="day02_input.txt", interval=1.0):
+    # yields (part 1, part 2) for the log at path now and then again every time it changes
+    follower = GameLogFollower(path)
+    last = None
+    while True:
+        answers = follower.poll()
+        if answers != last:
+            last = answers
+            yield answers
+        time.sleep(interval)
+
+
 if __name__ == "__main__":
     print(prob1())
     print(prob2())
@@ -38,25 +38,45 @@ Of course, the actual engine schematic is much larger. What is the sum of all of
 schematic?
 """
 
+import math
+import os
+import re
+from bisect import bisect_right
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 
-def prob1():
-    schematic = getSchematic("day03_input.txt")
+from inputs import readLines
+from tracing import span, traced
+
+NUMBER = re.compile(r"\d+")
+SYMBOL = re.compile(r"[^\d.\n]")
+
+try:
+    import numpy as np
+except ImportError:
+    # getSymbolMask marks around each symbol with plain lists without numpy
+    np = None
+
+
+def prob1(source="day03_input.txt"):
+    schematic = getSchematic(source)
+    mask = getSymbolMask(schematic)
     total = 0
-    # find numbers
-    for row in range(len(schematic)):
-        numbers = getNumbers(schematic[row])
-        for (start, end, num) in numbers:
-            if isPartNumber(start, end, schematic, row):
-                total += num
+    # find numbers, a number is a part number if any of its digits is next to a symbol
+    with span("day03.prob1.parts"):
+        for row in range(len(schematic)):
+            numbers = getNumbers(schematic[row])
+            for (start, end, num) in numbers:
+                if any(mask[row][start:end + 1]):
+                    total += num
     return total
 
 
-def getSchematic(file):
+@traced("day03.getSchematic")
+def getSchematic(source):
     schematic = []
-    with open(file) as f:
-        for line in f.readlines():
-            arr = [char for char in line if char != '\n']
-            schematic.append(arr)
+    for line in readLines(source):
+        arr = [char for char in line if char != '\n']
+        schematic.append(arr)
 
     return schematic
 
@@ -104,6 +124,35 @@ def isPartNumber(start, end, schematic, row):
     return False
 
 
+def isSymbol(character):
+    return character != '.' and not isDigit(character)
+
+
+@traced("day03.getSymbolMask")
+def getSymbolMask(schematic):
+    # mask[row][col] is True if schematic[row][col] is a symbol or next to one (diagonals count)
+    # worked out once for the whole schematic so checking a number is just looking at its span
+    width = max((len(row) for row in schematic), default=0)
+    if np is not None and width:
+        grid = np.array([row + ['.'] * (width - len(row)) for row in schematic], dtype="U1").reshape(-1, width)
+        symbols = np.pad((grid != '.') & ~np.char.isdigit(grid), 1)
+        # or together the symbol mask shifted to all 9 positions around each cell
+        mask = np.zeros(grid.shape, dtype=bool)
+        for dr in range(3):
+            for dc in range(3):
+                mask |= symbols[dr:dr + grid.shape[0], dc:dc + width]
+        return mask
+
+    mask = [[False] * len(row) for row in schematic]
+    for r in range(len(schematic)):
+        for c in range(len(schematic[r])):
+            if isSymbol(schematic[r][c]):
+                for nearRow in mask[max(r - 1, 0):r + 2]:
+                    start = max(c - 1, 0)
+                    nearRow[start:c + 2] = [True] * len(nearRow[start:c + 2])
+    return mask
+
+
 def isDigit(character):
     return str(character) in "0123456789"
 
@@ -157,25 +206,27 @@ is not a gear because it is only adjacent to one part number.) Adding up all of
 """
 
 
-def prob2():
-    schematic = getSchematic("day03_input.txt")
-    numbers = []
-    # find and store numbers and their start and end indices
-    for row in range(len(schematic)):
-        numbers.append(getNumbers(schematic[row]))
+def prob2(source="day03_input.txt"):
+    schematic = getSchematic(source)
+    # find the numbers and which cells each one covers
+    with span("day03.prob2.numbers"):
+        values, labels = labelNumbers(schematic)
 
     # look for a star, get gear ratio at each star and sum them all up
     ratios = 0
-    for row in range(len(schematic)):
-        for col in range(len(schematic[row])):
-            if schematic[row][col] == '*':
-                ratios += getGearRatio(schematic, row, col, numbers)
+    with span("day03.prob2.gears"):
+        for row in range(len(schematic)):
+            for col in range(len(schematic[row])):
+                if schematic[row][col] == '*':
+                    ratios += getLabeledGearRatio(labels, row, col, values)
 
     return ratios
 
 
+@traced("day03.getGearRatio")
 def getGearRatio(schematic, row, col, numbers):
-    # list of tuples representing parts in the form (startIndex, endIndex, number)
+    # list of tuples representing parts in the form (row, (startIndex, endIndex, number))
+    # the row is needed, the same number can sit at the same columns above and below the star
     parts = set()
 
     # find all gears adjacent to star in schematic[row][col] - if are exactly 2, return product
@@ -185,14 +236,356 @@ def getGearRatio(schematic, row, col, numbers):
         # if theres a number at the adj. index, add it to parts
         num = isNumberAt(schematic, row + dx, col + dy, numbers)
         if (num):
-            parts.add(num)
+            parts.add((row + dx, num))
+
+    if (len(parts) == 2):
+        return parts.pop()[1][2] * parts.pop()[1][2]
+    else:
+        return 0
+
+
+def labelNumbers(schematic):
+    # returns (values, labels) - values[i] is the i'th number in the schematic and labels[row][col] is
+    # the i of the number covering that cell, or None
+    values = []
+    labels = []
+    for row in schematic:
+        labelRow = [None] * len(row)
+        for (start, end, num) in getNumbers(row):
+            labelRow[start:end + 1] = [len(values)] * (end - start + 1)
+            values.append(num)
+        labels.append(labelRow)
+    return values, labels
+
+
+def getLabeledGearRatio(labels, row, col, values):
+    # same as getGearRatio but each neighbour is one lookup in the label grid, the set drops the
+    # repeats when one number touches the star at several cells
+    parts = set()
+    for labelRow in labels[max(row - 1, 0):row + 2]:
+        for label in labelRow[max(col - 1, 0):col + 2]:
+            if label is not None:
+                parts.add(label)
 
     if (len(parts) == 2):
-        return parts.pop()[2] * parts.pop()[2]
+        return values[parts.pop()] * values[parts.pop()]
     else:
         return 0
 
 
+class SchematicGraph:
+    # which numbers every symbol touches, worked out in one pass so any number of questions about
+    # symbols and numbers can be answered without looking at the grid again
+    #
+    #   graph = SchematicGraph.fromSource("day03_input.txt")
+    #   graph.partSum()                                  # part 1
+    #   graph.ratioSum()                                 # part 2, '*' touching exactly 2 numbers
+    #   graph.aggregate(sum, kind="#")                   # {(row, col): sum of its numbers} for every '#'
+
+    @traced("day03.SchematicGraph")
+    def __init__(self, schematic):
+        self.values, labels = labelNumbers(schematic)
+        self.symbols = []  # (row, col, char)
+        self.numbersOf = []  # number ids touching each symbol, same order as symbols
+        self.symbolsOf = [[] for _ in self.values]  # symbol ids touching each number
+        for row in range(len(schematic)):
+            for col in range(len(schematic[row])):
+                if not isSymbol(schematic[row][col]):
+                    continue
+                touching = set()
+                for labelRow in labels[max(row - 1, 0):row + 2]:
+                    for label in labelRow[max(col - 1, 0):col + 2]:
+                        if label is not None:
+                            touching.add(label)
+                for label in touching:
+                    self.symbolsOf[label].append(len(self.symbols))
+                self.numbersOf.append(sorted(touching))
+                self.symbols.append((row, col, schematic[row][col]))
+
+    @classmethod
+    def fromSource(cls, source="day03_input.txt"):
+        return cls(getSchematic(source))
+
+    def partSum(self):
+        # numbers that touch at least one symbol
+        return sum(self.values[n] for n in range(len(self.values)) if self.symbolsOf[n])
+
+    def findSymbols(self, kind=None, count=None):
+        # ids of the symbols that are kind (any symbol if None) and touch exactly count numbers (any if None)
+        return [s for s in range(len(self.symbols))
+                if (kind is None or self.symbols[s][2] == kind)
+                and (count is None or len(self.numbersOf[s]) == count)]
+
+    def aggregate(self, func, kind=None, count=None):
+        # {(row, col): func(values of the numbers it touches)} for the symbols findSymbols picks
+        return {self.symbols[s][:2]: func([self.values[n] for n in self.numbersOf[s]])
+                for s in self.findSymbols(kind, count)}
+
+    def ratioSum(self, kind='*', count=2):
+        return sum(self.aggregate(math.prod, kind, count).values())
+
+
+class EditableSchematic:
+    # a schematic whose cells can be changed while keeping both answers up to date. an edit can only
+    # change the numbers around the cell, whether they touch a symbol, and the stars next to those
+    # numbers or the cell, so only those are taken out of the totals and put back after the edit
+
+    def __init__(self, schematic):
+        self.grid = [list(row) for row in schematic]
+        graph = SchematicGraph(self.grid)
+        self.partTotal = graph.partSum()
+        self.ratioTotal = graph.ratioSum()
+
+    @classmethod
+    def fromSource(cls, source="day03_input.txt"):
+        return cls(getSchematic(source))
+
+    def set(self, row, col, char):
+        # puts char at (row, col), returns the new (part 1, part 2)
+        if not (0 <= row < len(self.grid) and 0 <= col < len(self.grid[row])):
+            raise IndexError("no cell at row %d col %d" % (row, col))
+
+        before = self._numbersAround(row, col)
+        stars = {(r, c) for r in range(row - 1, row + 2) for c in range(col - 1, col + 2)}
+        for (r, start, end, _) in before:
+            stars.update(self._cellsAround(r, start, end))
+        # the only new number spans are made of old number cells and (row, col), so the stars that
+        # could touch them are all in stars already
+        self.partTotal -= sum(num for (r, start, end, num) in before if self._isPart(r, start, end))
+        self.ratioTotal -= sum(self._ratioAt(r, c) for (r, c) in stars)
+
+        self.grid[row][col] = char
+
+        after = self._numbersAround(row, col)
+        self.partTotal += sum(num for (r, start, end, num) in after if self._isPart(r, start, end))
+        self.ratioTotal += sum(self._ratioAt(r, c) for (r, c) in stars)
+        return self.partTotal, self.ratioTotal
+
+    def _numberAt(self, row, col):
+        # (row, start, end, number) of the number covering (row, col), or None
+        if not (0 <= row < len(self.grid) and 0 <= col < len(self.grid[row])) or not isDigit(self.grid[row][col]):
+            return None
+        line = self.grid[row]
+        start = end = col
+        while start > 0 and isDigit(line[start - 1]):
+            start -= 1
+        while end + 1 < len(line) and isDigit(line[end + 1]):
+            end += 1
+        return row, start, end, int("".join(line[start:end + 1]))
+
+    def _numbersAround(self, row, col):
+        # every number with a digit in the 3x3 around (row, col)
+        numbers = set()
+        for (r, c) in self._cellsAround(row, col, col):
+            number = self._numberAt(r, c)
+            if number:
+                numbers.add(number)
+        return numbers
+
+    def _cellsAround(self, row, start, end):
+        # cells of the grid in and around the span row[start..end]
+        for r in range(max(row - 1, 0), min(row + 2, len(self.grid))):
+            for c in range(max(start - 1, 0), min(end + 2, len(self.grid[r]))):
+                yield r, c
+
+    def _isPart(self, row, start, end):
+        return any(isSymbol(self.grid[r][c]) for (r, c) in self._cellsAround(row, start, end))
+
+    def _ratioAt(self, row, col):
+        if not (0 <= row < len(self.grid) and 0 <= col < len(self.grid[row])) or self.grid[row][col] != '*':
+            return 0
+        numbers = self._numbersAround(row, col)
+        if len(numbers) == 2:
+            return numbers.pop()[3] * numbers.pop()[3]
+        return 0
+
+
+class SparseSchematic:
+    # only the numbers and symbols of a schematic, bucketed by row, for schematics that are mostly dots.
+    # memory and time go with how many things are in the schematic instead of its width times height
+
+    def __init__(self, numbers, symbols):
+        # numbers is row -> [(start, end, number)] and symbols is row -> [(col, char)], both sorted, rows
+        # with nothing in them left out (what scanSparse returns)
+        self.numbers = numbers
+        self.numberStarts = {row: [n[0] for n in nums] for row, nums in numbers.items()}  # to bisect on
+        self.symbols = symbols
+        self.symbolCols = {row: [s[0] for s in syms] for row, syms in symbols.items()}  # to bisect on
+
+    @classmethod
+    def fromSource(cls, source="day03_input.txt"):
+        return cls(*scanSparse(source))
+
+    def hasSymbol(self, row, start, end):
+        # is there a symbol in row between columns start and end (inclusive)
+        cols = self.symbolCols.get(row)
+        if cols is None:
+            return False
+        i = bisect_right(cols, end)
+        return i > 0 and cols[i - 1] >= start
+
+    def numbersNear(self, row, col):
+        # numbers with a digit in the 3x3 around (row, col)
+        near = []
+        for r in (row - 1, row, row + 1):
+            starts = self.numberStarts.get(r)
+            if starts is None:
+                continue
+            # numbers dont overlap, so walking back from the last one starting by col + 1 finds them all
+            i = bisect_right(starts, col + 1) - 1
+            while i >= 0 and self.numbers[r][i][1] >= col - 1:
+                near.append(self.numbers[r][i][2])
+                i -= 1
+        return near
+
+    def partSum(self):
+        total = 0
+        for row, numbers in self.numbers.items():
+            for (start, end, num) in numbers:
+                if any(self.hasSymbol(r, start - 1, end + 1) for r in (row - 1, row, row + 1)):
+                    total += num
+        return total
+
+    def ratioSum(self):
+        ratios = 0
+        for row, symbols in self.symbols.items():
+            for (col, char) in symbols:
+                if char == '*':
+                    near = self.numbersNear(row, col)
+                    if len(near) == 2:
+                        ratios += near[0] * near[1]
+        return ratios
+
+
+@traced("day03.scanSparse")
+def scanSparse(source):
+    # (numbers, symbols) for SparseSchematic, read a line at a time without ever building the grid
+    numbers = {}
+    symbols = {}
+    for row, line in enumerate(readLines(source)):
+        rowNumbers = [(m.start(), m.end() - 1, int(m.group())) for m in NUMBER.finditer(line)]
+        if rowNumbers:
+            numbers[row] = rowNumbers
+        rowSymbols = [(m.start(), m.group()) for m in SYMBOL.finditer(line)]
+        if rowSymbols:
+            symbols[row] = rowSymbols
+    return numbers, symbols
+
+
+def streamSchematic(source="day03_input.txt"):
+    # yields (row, part numbers, gear ratios) for each row of the schematic, reading it one line at a
+    # time - both parts only ever look one row up and one down, so only three rows are kept around
+    above = current = None
+    index = 0
+    for line in readLines(source):
+        below = scanRow(line.rstrip("\n"))
+        if current is not None:
+            yield (index,) + checkRow(above, current, below)
+            index += 1
+        above, current = current, below
+
+    if current is not None:
+        yield (index,) + checkRow(above, current, None)
+
+
+def streamSolve(source="day03_input.txt"):
+    # (part 1, part 2) from one pass of streamSchematic
+    total = ratios = 0
+    with span("day03.streamSolve"):
+        for (_, parts, gears) in streamSchematic(source):
+            total += sum(parts)
+            ratios += sum(gears)
+    return total, ratios
+
+
+def parallelSolve(source="day03_input.txt", workers=None, bandRows=2048):
+    # (part 1, part 2) with the schematic split into bands of bandRows rows that worker processes
+    # solve on their own. each band gets the row just above and below it to look at, but only counts
+    # numbers and stars in its own rows, so anything next to a band edge is counted exactly once
+    # only a couple of bands per worker are handed out at a time and more are read as those finish, so
+    # about workers * bandRows rows are held in memory however big the schematic is
+    workers = workers or os.cpu_count()
+    lines = (line.rstrip("\n") for line in readLines(source))
+    total = ratios = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for band in iterBands(lines, bandRows):
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    total += future.result()[0]
+                    ratios += future.result()[1]
+            pending.add(pool.submit(solveBand, band))
+        for future in wait(pending).done:
+            total += future.result()[0]
+            ratios += future.result()[1]
+    return total, ratios
+
+
+def iterBands(lines, bandRows):
+    # yields (row above or None, rows of the band, row below or None)
+    above = None
+    band = []
+    for line in lines:
+        if len(band) == bandRows:
+            yield above, band, line
+            above = band[-1]
+            band = []
+        band.append(line)
+    if band:
+        yield above, band, None
+
+
+def solveBand(task):
+    # runs in a worker - (sum of part numbers, sum of gear ratios) for the rows of one band
+    above, band, below = task
+    rows = [scanRow(line) for line in band]
+    rows = [scanRow(above) if above is not None else None] + rows + [scanRow(below) if below is not None else None]
+    total = ratios = 0
+    for i in range(1, len(rows) - 1):
+        parts, gears = checkRow(rows[i - 1], rows[i], rows[i + 1])
+        total += sum(parts)
+        ratios += sum(gears)
+    return total, ratios
+
+
+def scanRow(line):
+    # (line, numbers, labels) for one row, labels[col] is the index in numbers of the number at col
+    numbers = getNumbers(line)
+    labels = [None] * len(line)
+    for i, (start, end, _) in enumerate(numbers):
+        labels[start:end + 1] = [i] * (end - start + 1)
+    return line, numbers, labels
+
+
+def checkRow(above, current, below):
+    # part numbers and gear ratios of the middle of three scanned rows (above/below None at the edges)
+    rows = [row for row in (above, current, below) if row is not None]
+    line, numbers, _ = current
+
+    parts = []
+    for (start, end, num) in numbers:
+        for (nearLine, _, _) in rows:
+            if any(isSymbol(c) for c in nearLine[max(start - 1, 0):end + 2]):
+                parts.append(num)
+                break
+
+    gears = []
+    col = line.find('*')
+    while col != -1:
+        touching = set()
+        for r, (_, _, labels) in enumerate(rows):
+            for label in labels[max(col - 1, 0):col + 2]:
+                if label is not None:
+                    touching.add((r, label))
+        if len(touching) == 2:
+            (r1, n1), (r2, n2) = touching
+            gears.append(rows[r1][1][n1][2] * rows[r2][1][n2][2])
+        col = line.find('*', col + 1)
+
+    return parts, gears
+
+
 def isNumberAt(schematic, row, col, numbers):
     # is there a number that occupies schematic[row][col] ?
     # if not valid coords, return none
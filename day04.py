@@ -53,27 +53,31 @@ Take a seat in the large pile of colorful cards. How many points are they worth
 
 """
 
+from collections import deque
 
-def prob1():
+from inputs import readLines
+from tracing import span, traced
+
+
+def prob1(source="day04_input.txt"):
     total = 0
-    with open("day04_input.txt") as f:
-        for line in f.readlines():
+    with span("day04.prob1.cards"):
+        for line in readLines(source):
             card = Card(line)
             total += card.points
     return total
 
 
 class Card:
+    @traced("day04.Card")
     def __init__(self, string):
-        # replace : w/ ' | ' so can split by vertical line
-        string = string.replace(":", " |")
-        string = string.replace("\n", "")
-        string = string.replace("  ", " ")  # double space to single space
-        # sections is card NUM: , numbers, winning numbers
-        sections = string.split(" | ")
-        self.id = int(sections[0].split(" ")[-1])  # number
-        self.numbers = sections[1].split(" ")
-        self.winners = sections[2].split(" ")
+        # sections are "Card NUM", numbers, winning numbers - split() with no separator so runs of
+        # spaces never leave empty tokens behind
+        header, _, string = string.partition(":")
+        numbers, _, winners = string.partition("|")
+        self.id = int(header.split()[-1])  # number
+        self.numbers = [int(num) for num in numbers.split()]
+        self.winners = [int(num) for num in winners.split()]
         self.numMatches = self._getMatches()
         # points are 2^(number of winning numbers - 1)
         # so 1 card is 2^0 = 1, 2 is 2^1 = 2, etc.
@@ -81,12 +85,10 @@ class Card:
             2**(self.numMatches - 1))
 
     def _getMatches(self):
-        numMatches = 0
-        for num in self.numbers:
-            if num in self.winners:
-                numMatches += 1
-
-        return numMatches
+        # every entry of numbers that is a winner counts, repeats included - a set makes each lookup
+        # O(1) instead of scanning the winners list
+        winners = set(self.winners)
+        return sum(num in winners for num in self.numbers)
 
     def __str__(self):
         return "Card " + str(self.id) + ":\n\tnumbers: " + str(self.numbers) + "\n\twinning numbers: " + str(self.winners) + "\n\tpoints: " + str(self.points)
@@ -137,24 +139,39 @@ of scratchcards, how many total scratchcards do you end up with?
 """
 
 
-def prob2():
-    # get all cards originally, store in list
-    cards = []
-    with open("day04_input.txt") as f:
-        for line in f.readlines():
-            cards.append(Card(line))
-
-    # for each card, find how many matches it has and then add the next 'match' cards to the list
-    # of cards to be evaluated
-    numScratchers = 0
-    cardsToEval = cards.copy()
-    while (cardsToEval):
-        card = cardsToEval.pop()
-        numScratchers += 1
-        id = card.id
+def prob2(source="day04_input.txt"):
+    total, _ = countCards(source)
+    return total
+
+
+def countCards(source="day04_input.txt"):
+    # (total scratchcards, how many of each card you end up with)
+    with span("day04.prob2.parse"):
+        matches = [Card(line).numMatches for line in readLines(source)]
+
+    # instead of handing out every copy one at a time, each card adds however many of it there are to
+    # the next 'matches' cards. every card only gets copies from cards before it, so one pass does it
+    with span("day04.prob2.copies"):
+        counts = [1] * len(matches)
+        for i in range(len(matches)):
+            for j in range(i + 1, min(i + 1 + matches[i], len(matches))):
+                counts[j] += counts[i]
+
+    return sum(counts), counts
+
+
+def streamCounts(source="day04_input.txt"):
+    # yields (card id, how many of it you end up with) as the cards are read - only the copies still
+    # owed to the next few cards are kept, never more than the most matches on one card
+    pending = deque()
+    for line in readLines(source):
+        card = Card(line)
+        count = 1 + (pending.popleft() if pending else 0)
+        while len(pending) < card.numMatches:
+            pending.append(0)
         for i in range(card.numMatches):
-            cardsToEval.append(cards[id + i])
-    return numScratchers
+            pending[i] += count
+        yield card.id, count
 
 
 if __name__ == "__main__":
@@ -127,43 +127,49 @@ What is the lowest location number that corresponds to any of the initial seed n
 
 import sys
 
+from cache import cached
+from inputs import readLines
+from tracing import span, traced
 
-def prob1():
-    seeds, maps = readInput("day05_input.txt")
+
+def prob1(source="day05_input.txt"):
+    seeds, maps = readInput(source)
     # find lowest location number - since thats last transformation map, just transform all through
     # all maps and then return min of the list of seeds
-    for m in maps:
-        for i in range(len(seeds)):
-            seeds[i] = m.transform(seeds[i])
+    with span("day05.prob1.transform"):
+        for m in maps:
+            for i in range(len(seeds)):
+                seeds[i] = m.transform(seeds[i])
 
     return min(seeds)
 
 
-def readInput(fileName):
+@traced("day05.readInput")
+@cached("day05.readInput", version=2)
+def readInput(source):
     # save maps
     maps = []
 
-    with open(fileName) as f:
-        # get seeds
-        seeds = f.readline().split()
-        seeds = seeds[1:]  # dont include string that says 'seeds:'
-        seeds = [int(i) for i in seeds]
-        # now find maps while we still have lines to read
-        line = f.readline()
-        while (line):
-            # get info for map
-            mapString = ""
-            while (line != '\n'):
-                mapString += line
-                line = f.readline()
-                # check end of file
-                if (line == ""):
-                    break
-            # add it to list
-            if mapString:
-                currMap = Map(mapString)
-                maps.append(currMap)
-            line = f.readline()
+    # next(lines, None) gives None at the end of the input - lines may or may not end in '\n' (a list
+    # from splitlines() doesnt), so a blank line is any line with nothing but whitespace
+    lines = readLines(source)
+    # get seeds
+    seeds = (next(lines, None) or "").split()
+    seeds = seeds[1:]  # dont include string that says 'seeds:'
+    seeds = [int(i) for i in seeds]
+    # now find maps while we still have lines to read
+    line = next(lines, None)
+    while (line is not None):
+        # get info for map
+        mapLines = []
+        while (line is not None and line.strip()):
+            mapLines.append(line.rstrip("\r\n"))
+            line = next(lines, None)
+        # add it to list
+        if mapLines:
+            currMap = Map("\n".join(mapLines))
+            maps.append(currMap)
+        line = next(lines, None)
 
     return seeds, maps
 
@@ -199,6 +205,32 @@ class Map:
         # else none of the mappers changed the value
         return num
 
+    def transformRanges(self, ranges):
+        # like transform but for whole ranges of numbers at once - ranges is a list of (start, end) with
+        # end not included. a range gets split up wherever a mapper starts or stops partway through it
+        transformed = []
+        for (start, end) in ranges:
+            for m in self.mappers:
+                # mappers are sorted by source, so once one starts past the range none of the rest overlap
+                if m.sources[0] >= end:
+                    break
+                if m.sources[1] < start:
+                    continue
+                # piece before the mapper isnt mapped
+                if start < m.sources[0]:
+                    transformed.append((start, m.sources[0]))
+                    start = m.sources[0]
+                stop = min(end, m.sources[1] + 1)
+                offset = m.dests[0] - m.sources[0]
+                transformed.append((start + offset, stop + offset))
+                start = stop
+                if start >= end:
+                    break
+            # piece after the last mapper isnt mapped either
+            if start < end:
+                transformed.append((start, end))
+        return transformed
+
     def __str__(self):
         ret = ""
         ret += self.name + "\n"
@@ -260,8 +292,8 @@ the lowest location number that corresponds to any of the initial seed numbers?
 """
 
 
-def prob2():
-    seeds, maps = readInput("day05_input.txt")
+def prob2(source="day05_input.txt"):
+    seeds, maps = readInput(source)
 
     # make seed ranges list
     seedRanges = []
@@ -272,22 +304,24 @@ def prob2():
 
     hash = {}
     minScore = sys.maxsize
-    for (source, rangeLength) in seedRanges:
-        # too big to iterate thru all of them, try checking in steps
-        # if we find the new min, test all values in between last step and new step
-        # (step +1 is will never be 0, even if rangeLength < 1000)
-        step = int(rangeLength/1000) + 1
-        for i in range(source, source + rangeLength, step):
-            if (hash.get(i, None) == None):
-                hash[i] = getTransformation(i, maps)
-                # if is a new min, test all vals around it to make sure we didnt miss the real min
-                if (hash[i] < minScore):
-                    minScore = min(hash[i], getMinInSteps(
-                        i, step, maps, source, rangeLength))
+    with span("day05.prob2.search"):
+        for (source, rangeLength) in seedRanges:
+            # too big to iterate thru all of them, try checking in steps
+            # if we find the new min, test all values in between last step and new step
+            # (step +1 is will never be 0, even if rangeLength < 1000)
+            step = int(rangeLength/1000) + 1
+            for i in range(source, source + rangeLength, step):
+                if (hash.get(i, None) == None):
+                    hash[i] = getTransformation(i, maps)
+                    # if is a new min, test all vals around it to make sure we didnt miss the real min
+                    if (hash[i] < minScore):
+                        minScore = min(hash[i], getMinInSteps(
+                            i, step, maps, source, rangeLength))
 
     return minScore
 
 
+@traced("day05.getMinInSteps")
 def getMinInSteps(current, step, maps, start, rangeLength):
     # given a step, start at curr - step and end at curr + step UNLESS is out of range
     begin = (current - step) if (current - step) >= start else start
@@ -301,12 +335,22 @@ def getMinInSteps(current, step, maps, start, rangeLength):
     return minScore
 
 
+@traced("day05.getTransformation")
 def getTransformation(num, maps):
     for m in maps:
         num = m.transform(num)
     return num
 
 
+def getRangeMin(seedRanges, maps):
+    # exact lowest location for a list of (start, length) seed ranges, no sampling - the ranges get
+    # pushed through every map as ranges, so the work depends on the number of mappers not on the range sizes
+    ranges = [(start, start + length) for (start, length) in seedRanges if length > 0]
+    for m in maps:
+        ranges = m.transformRanges(ranges)
+    return min(start for (start, end) in ranges) if ranges else sys.maxsize
+
+
 if __name__ == "__main__":
     print(prob1())
     print(prob2())
@@ -70,26 +70,33 @@ Determine the number of ways you could beat the record in each race. What do you
 these numbers together?
 """
 
+import math
 
-def prob1():
+from inputs import readLines
+from tracing import span
+
+
+def prob1(source="day06_input.txt"):
     # get times and distances
-    with open("day06_input.txt") as f:
-        times = f.readline().split()
-        distances = f.readline().split()
-    # convert all numbers to their numeric value, not a string
-    times = [int(i) for i in times if i.isdigit()]
-    distances = [int(i) for i in distances if i.isdigit()]
+    with span("day06.prob1.parse"):
+        lines = readLines(source)
+        times = next(lines).split()
+        distances = next(lines).split()
+        # convert all numbers to their numeric value, not a string
+        times = [int(i) for i in times if i.isdigit()]
+        distances = [int(i) for i in distances if i.isdigit()]
 
     product = 1
-    for i in range(len(times)):
-        waysToWin = 0
-        for secondsHolding in range(1, times[i]):
-            speed = secondsHolding
-            timeToRace = times[i] - secondsHolding
-            # if we traveled more than the previous record, we won
-            if (timeToRace * speed > distances[i]):
-                waysToWin += 1
-        product *= waysToWin
+    with span("day06.prob1.races"):
+        for i in range(len(times)):
+            waysToWin = 0
+            for secondsHolding in range(1, times[i]):
+                speed = secondsHolding
+                timeToRace = times[i] - secondsHolding
+                # if we traveled more than the previous record, we won
+                if (timeToRace * speed > distances[i]):
+                    waysToWin += 1
+            product *= waysToWin
 
     return product
 
@@ -114,11 +121,11 @@ hold the button anywhere from 14 to 71516 milliseconds and beat the record, a to
 How many ways can you beat the record in this one much longer race?"""
 
 
-def prob2():
+def prob2(source="day06_input.txt"):
     # get times and distances - combine all string vals and then convert to number
-    with open("day06_input.txt") as f:
-        times = f.readline().split()
-        distances = f.readline().split()
+    lines = readLines(source)
+    times = next(lines).split()
+    distances = next(lines).split()
     time = ""
     for i in times:
         if i.isdigit():
@@ -131,16 +138,34 @@ def prob2():
     distance = int(distance)
 
     waysToWin = 0
-    for secondsHolding in range(1, time):
-        speed = secondsHolding
-        timeToRace = time - secondsHolding
-        # if we traveled more than the previous record, we won
-        if (timeToRace * speed > distance):
-            waysToWin += 1
+    with span("day06.prob2.race"):
+        for secondsHolding in range(1, time):
+            speed = secondsHolding
+            timeToRace = time - secondsHolding
+            # if we traveled more than the previous record, we won
+            if (timeToRace * speed > distance):
+                waysToWin += 1
 
     return waysToWin
 
 
+def waysToWin(time, distance):
+    # closed form of the loops above - holding for h wins when h * (time - h) > distance, and the
+    # winning h's are the whole numbers strictly between the two roots of h^2 - time*h + distance = 0
+    disc = time * time - 4 * distance
+    if disc <= 0:
+        return 0
+    # smallest winning h, isqrt gets it close and the loops fix up the rounding
+    low = max((time - math.isqrt(disc)) // 2, 1)
+    while low < time and low * (time - low) <= distance:
+        low += 1
+    while low > 1 and (low - 1) * (time - low + 1) > distance:
+        low -= 1
+    # winning h's are symmetric around time / 2
+    high = time - low
+    return max(high - low + 1, 0)
+
+
 if __name__ == "__main__":
     print(prob1())
     print(prob2())
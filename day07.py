@@ -83,6 +83,11 @@ this example are 6440.
 
 Find the rank of every hand in your set. What are the total winnings?"""
 
+from cache import cached
+from inputs import readLines
+from tracing import span, traced
+
+
 FIVE_OF_A_KIND = 6
 FOUR_OF_A_KIND = 5
 FULL_HOUSE = 4
@@ -95,12 +100,10 @@ HIGH_CARD = 0
 cards = [char for char in "AKQJT98765432"]
 
 
-def prob1():
-    hands = []
-    with open("day07_input.txt") as f:
-        for line in f.readlines():
-            hands.append(Hand(line))
-    hands.sort()
+def prob1(source="day07_input.txt"):
+    hands = getHands(source)
+    with span("day07.prob1.sort"):
+        hands.sort()
     # now get total by multiplying each rank by their bid and adding them all up
     total = 0
     for i in range(len(hands)):
@@ -110,6 +113,15 @@ def prob1():
     return total
 
 
+@traced("day07.getHands")
+@cached("day07.getHands", version=1)
+def getHands(source):
+    hands = []
+    for line in readLines(source):
+        hands.append(Hand(line))
+    return hands
+
+
 class Hand:
     global FIVE_OF_A_KIND, FOUR_OF_A_KIND, FULL_HOUSE, THREE_OF_A_KIND, TWO_PAIR, ONE_PAIR, HIGH_CARD
     global cards
@@ -257,12 +269,10 @@ Using the new joker rule, find the rank of every hand in your set. What are the
 cards = [i for i in "AKQT98765432J"]  # new order of importance for cards
 
 
-def prob2():
-    hands = []
-    with open("day07_input.txt") as f:
-        for line in f.readlines():
-            hands.append(NewHand(line))
-    hands.sort()
+def prob2(source="day07_input.txt"):
+    hands = getNewHands(source)
+    with span("day07.prob2.sort"):
+        hands.sort()
     # now get total by multiplying each rank by their bid and adding them all up
     total = 0
     for i in range(len(hands)):
@@ -271,6 +281,15 @@ def prob2():
     return total
 
 
+@traced("day07.getNewHands")
+@cached("day07.getNewHands", version=1)
+def getNewHands(source):
+    hands = []
+    for line in readLines(source):
+        hands.append(NewHand(line))
+    return hands
+
+
 class NewHand(Hand):
 
     global cards
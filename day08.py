@@ -44,36 +44,43 @@ Starting at AAA, follow the left/right instructions. How many steps are required
 
 """
 
+from cache import cached
+from inputs import readLines
+from tracing import span, traced
 
-def prob1():
-    directions, dict = getDirectionsDict("day08_input.txt")
+
+def prob1(source="day08_input.txt"):
+    directions, dict = getDirectionsDict(source)
     # now follow directions until we get to ZZZ
     current = 'AAA'
     steps = 0
-    while (current != 'ZZZ'):
-        for d in directions:
-            steps += 1
-            if (d == 'L'):
-                current = dict[current][0]
-            else:
-                current = dict[current][1]
-            if current == 'ZZZ':
-                break
+    with span("day08.prob1.walk"):
+        while (current != 'ZZZ'):
+            for d in directions:
+                steps += 1
+                if (d == 'L'):
+                    current = dict[current][0]
+                else:
+                    current = dict[current][1]
+                if current == 'ZZZ':
+                    break
     return steps
 
 
-def getDirectionsDict(file):
+@traced("day08.getDirectionsDict")
+@cached("day08.getDirectionsDict", version=1)
+def getDirectionsDict(source):
     dict = {}
-    with open(file) as f:
-        lines = f.readlines()
-        directions = lines[0].replace("\n", "")
-        for line in lines[2:]:
-            # save in a dictionary where the key is the location - the value is an array [left, right]
-            # remove punctuation
-            line = line.replace(",", "").replace(
-                "=", "").replace("(", "").replace(")", "")
-            line = line.split()
-            dict[line[0]] = [line[1], line[2]]
+    lines = readLines(source)
+    directions = next(lines).replace("\n", "")
+    next(lines)  # skip the blank line after the directions
+    for line in lines:
+        # save in a dictionary where the key is the location - the value is an array [left, right]
+        # remove punctuation
+        line = line.replace(",", "").replace(
+            "=", "").replace("(", "").replace(")", "")
+        line = line.split()
+        dict[line[0]] = [line[1], line[2]]
 
     return (directions, dict)
 
@@ -124,8 +131,8 @@ that end with Z?
 """
 
 
-def prob2():
-    directions, dict = getDirectionsDict("day08_input.txt")
+def prob2(source="day08_input.txt"):
+    directions, dict = getDirectionsDict(source)
     currents = endsInA(dict)
     # brute forcing takes a billion years, instead find # steps for each location in currents to get to a
     # location ending in z and then find least common multiple of all the steps
@@ -133,6 +140,7 @@ def prob2():
     return lcm(steps)
 
 
+@traced("day08.lcm")
 def lcm(numbers):
     # if numbers = a, b, c then lcm(a, b, c) = lcm(a, lcm(b, c))
     if len(numbers) == 2:
@@ -159,6 +167,7 @@ def endsInA(dictionary):
     return a
 
 
+@traced("day08.getSteps")
 def getSteps(current, dictionary, directions):
     # given currentn location, find how many steps it takes (following the directions)
     # to get to a location that ends in Z
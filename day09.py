@@ -86,13 +86,17 @@ values?
 
 """
 
+from inputs import readLines
+from tracing import span
 
-def prob1():
-    histories = getHistories("day09_input.txt")
+
+def prob1(source="day09_input.txt"):
+    histories = getHistories(source)
     newNums = []
-    for h in histories:
-        num = getNewNum(h)
-        newNums.append(num)
+    with span("day09.prob1.extrapolate"):
+        for h in histories:
+            num = getNewNum(h)
+            newNums.append(num)
     return sum(newNums)
 
 
@@ -120,14 +124,10 @@ def getNextSeq(arr):
     return seq
 
 
-def getHistories(file):
-    histories = []
-    with open(file) as f:
-        lines = f.readlines()
-        for line in lines:
-            h = [int(num) for num in line.split()]
-            histories.append(h)
-    return histories
+def getHistories(source):
+    # yields histories one line at a time, each history only needs to be looked at once
+    for line in readLines(source):
+        yield [int(num) for num in line.split()]
 
 
 """
@@ -159,12 +159,13 @@ these extrapolated values?
 """
 
 
-def prob2():
-    histories = getHistories("day09_input.txt")
+def prob2(source="day09_input.txt"):
+    histories = getHistories(source)
     nums = []
-    for h in histories:
-        num = getPrevNum(h)
-        nums.append(num)
+    with span("day09.prob2.extrapolate"):
+        for h in histories:
+            num = getPrevNum(h)
+            nums.append(num)
     return sum(nums)
 
 
@@ -115,22 +115,32 @@ position to the point farthest from the starting position?
 
 """
 
+from cache import cached
+from inputs import readLines
+from tracing import traced
 
-def prob1():
+
+def prob1(source="day10_input.txt"):
     # find steps to farthest part of loop
-    g = Grid("day10_input.txt")
+    g = Grid(source)
     return max(g.distances.values())
 
 
+@traced("day10.readGrid")
+@cached("day10.readGrid", version=1)
+def readGrid(source):
+    # grid as a list of rows, each row a list of characters
+    grid = []
+    for line in readLines(source):
+        r = [c for c in line.rstrip("\n")]
+        grid.append(r)
+    return grid
+
+
 class Grid:
 
-    def __init__(self, file):
-        self.grid = []
-        with open(file) as f:
-            lines = f.readlines()
-            for line in lines:
-                r = [c for c in line[:-1]]
-                self.grid.append(r)
+    def __init__(self, source):
+        self.grid = readGrid(source)
         self.height = len(self.grid)
         self.width = len(self.grid[0]) if self.height > 0 else 0
         self.animal = self._findAnimal()
@@ -138,6 +148,7 @@ class Grid:
         self.adjList = self._getAdjList()
         self.distances = self._getDistances()
 
+    @traced("day10.Grid._getAdjList")
     def _getAdjList(self):
         # adjacency list for all reachable points in loop (nodes)
         a = {}
@@ -153,6 +164,7 @@ class Grid:
 
         return a
 
+    @traced("day10.Grid._getDistances")
     def _getDistances(self):
         # saves a hashtable of distances from self.animal to all reachable points in the grid
         import sys
@@ -173,6 +185,7 @@ class Grid:
                     toVisit.append(neighbor)
         return dists
 
+    @traced("day10.Grid._findAnimal")
     def _findAnimal(self):
         # find spot where 'S' is in grid, thats where the animal is
         for i in range(self.height):
@@ -181,6 +194,7 @@ class Grid:
                     return (i, j)
         return (0, 0)
 
+    @traced("day10.Grid._getCoordsInLoop")
     def _getCoordsInLoop(self):
         # start at animal position, add all 'reachable' positions (aka coords in the loop) to an array and return it
         toTest = [self.animal]
@@ -338,17 +352,18 @@ enclosed by the loop?
 """
 
 
-def prob2():
-    g = NewGrid("test.txt")
+def prob2(source="day10_input.txt"):
+    g = NewGrid(source)
     return g.enclosedTiles
 
 
 class NewGrid(Grid):
 
-    def __init__(self, file):
-        super().__init__(file)
+    def __init__(self, source):
+        super().__init__(source)
         self.enclosedTiles = self._getEnclosed()
 
+    @traced("day10.NewGrid._getEnclosed")
     def _getEnclosed(self):
         # go through all pipes in the loop and add all points to the right UNTIL we hit more pipes in the loop
         # not sure how to determine which way is 'right'
@@ -0,0 +1,502 @@
+"""
+differential testing - runs the current solutions (the reference) and any faster engines registered
+for the same day and part side by side on generated inputs, and checks they always agree
+
+    python differential.py                  # every day that has a generator
+    python differential.py 5 6 --cases 200 --size 50 --seed 7
+
+for every engine it reports how many cases disagreed with the reference and how much faster it was
+overall. the first disagreement is shrunk down (by throwing away input lines while it keeps
+disagreeing the same way) and printed so it can be replayed by hand
+
+engines take the input as a list of lines and return the answer:
+
+    @engine(6, 2, "closedForm")
+    def day06ClosedForm(lines):
+        ...
+"""
+
+import argparse
+import random
+import string
+import sys
+import time
+
+from aoc23 import loadDay
+
+# (day, part) -> {engine name: function}, the reference engines are added by registerReferences
+engines = {}
+
+# day -> function(rng, size) that returns a list of input lines
+generators = {}
+
+REFERENCE = "reference"
+NO_NEWLINES = "noNewlines"
+
+
+def engine(day, part, name):
+    def register(func):
+        engines.setdefault((day, part), {})[name] = func
+        return func
+    return register
+
+
+def generator(day):
+    def register(func):
+        generators[day] = func
+        return func
+    return register
+
+
+def registerReferences():
+    # the probN functions as they are now are what everything else gets compared to, and the same
+    # functions given the lines without their '\n' (like a list from splitlines()) have to agree
+    for day in generators:
+        module = loadDay(day)
+        for part in (1, 2):
+            if hasattr(module, "prob" + str(part)):
+                solve = getattr(module, "prob" + str(part))
+                engines.setdefault((day, part), {})[REFERENCE] = solve
+                engines[(day, part)][NO_NEWLINES] = withoutNewlines(solve)
+
+
+def withoutNewlines(solve):
+    return lambda lines: solve([line.rstrip("\n") for line in lines])
+
+
+# generators
+
+SPELLED = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+
+
+@generator(1)
+def generateDay01(rng, size):
+    # lines of junk letters with digits and spelled digits mixed in, often overlapping (like 'twone')
+    lines = []
+    for _ in range(size):
+        pieces = [str(rng.randint(1, 9))]
+        for _ in range(rng.randint(0, 8)):
+            choice = rng.random()
+            if choice < 0.3:
+                pieces.append(rng.choice(SPELLED))
+            elif choice < 0.4:
+                pieces.append(str(rng.randint(1, 9)))
+            elif choice < 0.5:
+                # overlapping spelled digits
+                pieces.append(rng.choice(["twone", "eightwo", "oneight", "threeight", "sevenine", "fiveight"]))
+            else:
+                pieces.append("".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(1, 5))))
+        rng.shuffle(pieces)
+        lines.append("".join(pieces) + "\n")
+    return lines
+
+
+@generator(2)
+def generateDay02(rng, size):
+    # games of a few draws each, counts around the part 1 bag so some fit and some dont, and sometimes
+    # a color never shows up at all
+    lines = []
+    for game in range(1, size + 1):
+        draws = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(["red", "green", "blue"], rng.randint(1, 3))
+            draws.append(", ".join("%d %s" % (rng.randint(1, 20), color) for color in colors))
+        lines.append("Game %d: %s\n" % (game, "; ".join(draws)))
+    return lines
+
+
+@generator(3)
+def generateDay03(rng, size):
+    # a square of mostly dots with numbers and symbols scattered in, so numbers run into the edges,
+    # share symbols and sit next to several stars
+    rows = []
+    for _ in range(size):
+        row = ""
+        while len(row) < size:
+            choice = rng.random()
+            if choice < 0.25:
+                row += str(rng.randint(1, 999))
+            elif choice < 0.35:
+                row += rng.choice("*****#+$/=&@%-")
+            else:
+                row += "." * rng.randint(1, 3)
+        rows.append(row[:size] + "\n")
+    return rows
+
+
+@generator(4)
+def generateDay04(rng, size):
+    # the simulate engine hands out every copy one at a time, so matches stay small enough that it finishes
+    lines = []
+    for card in range(1, size + 1):
+        maxMatches = min(3, size - card)
+        matches = rng.randint(0, maxMatches)
+        pool = rng.sample(range(1, 100), 13)
+        winners = pool[:5]
+        numbers = pool[5 - matches:13 - matches]
+        if 0 < matches < maxMatches and rng.random() < 0.3:
+            # a repeated winning number counts as another match
+            winners[0] = winners[-1]
+            rng.shuffle(winners)
+        rng.shuffle(numbers)
+        lines.append("Card %3d: %s | %s\n" % (card, " ".join("%2d" % n for n in winners),
+                                              " ".join("%2d" % n for n in numbers)))
+    return lines
+
+
+@generator(5)
+def generateDay05(rng, size):
+    # seven maps of non overlapping ranges with gaps between them, numbers big enough that part 2's
+    # sampling has something to miss
+    scale = 10 ** rng.randint(2, 9)
+    seeds = []
+    for _ in range(rng.randint(1, 4)):
+        seeds += [rng.randrange(scale), rng.randint(1, scale)]
+    lines = ["seeds: " + " ".join(str(s) for s in seeds) + "\n"]
+    names = ["seed", "soil", "fertilizer", "water", "light", "temperature", "humidity", "location"]
+    for i in range(7):
+        lines.append("\n")
+        lines.append("%s-to-%s map:\n" % (names[i], names[i + 1]))
+        start = 0
+        for _ in range(rng.randint(1, max(1, size // 10))):
+            start += rng.randrange(scale // 4 + 1)
+            length = rng.randint(1, scale // 2 + 1)
+            lines.append("%d %d %d\n" % (rng.randrange(2 * scale), start, length))
+            start += length
+    return lines
+
+
+@generator(6)
+def generateDay06(rng, size):
+    # part 2 glues the numbers together and the reference loops over every millisecond of the result,
+    # so keep it to a few two digit races
+    races = rng.randint(1, 3)
+    times = [rng.randint(1, min(10 * size, 99)) for _ in range(races)]
+    # records anywhere from trivially beatable to just out of reach
+    distances = [rng.randint(0, t * t // 4 + 1) for t in times]
+    return ["Time:      " + "  ".join(str(t) for t in times) + "\n",
+            "Distance:  " + "  ".join(str(d) for d in distances) + "\n"]
+
+
+# engines
+
+@engine(1, 1, "bulk")
+def day01Bulk(lines):
+    return loadDay(1).bulkCalibration("".join(lines).encode())
+
+
+@engine(1, 2, "bulk")
+def day01BulkTrue(lines):
+    return loadDay(1).bulkTrueCalibration("".join(lines).encode())
+
+
+@engine(1, 2, "replaceSpelled")
+def day01ReplaceSpelled(lines):
+    # the original recursive rewrite, to check the regex scanner against
+    m = loadDay(1)
+    return sum(m.getReplacedCalibration(line) for line in lines)
+
+
+@engine(2, 1, "legacyGame")
+def day02LegacyGame1(lines):
+    # the original Game class that splits the line again for every color
+    m = loadDay(2)
+    possible = m.Game(red=12, green=13, blue=14)
+    return sum(game.id for game in map(m.Game, lines) if game.isPossible(possible))
+
+
+@engine(2, 2, "legacyGame")
+def day02LegacyGame2(lines):
+    m = loadDay(2)
+    return sum(m.NewGame(line).power for line in lines)
+
+
+@engine(2, 1, "columnar")
+def day02Columnar(lines):
+    m = loadDay(2)
+    return m.GameStore.fromSource(lines).query([m.BAG])[0][0]
+
+
+@engine(2, 1, "dominance")
+def day02Dominance(lines):
+    m = loadDay(2)
+    return m.DominanceIndex.fromSource(lines).queryOne(m.BAG)[0]
+
+
+@engine(2, 2, "columnar")
+def day02ColumnarPower(lines):
+    return loadDay(2).GameStore.fromSource(lines).powerTotal()
+
+
+@engine(3, 1, "adjacentChars")
+def day03AdjacentChars(lines):
+    # the original check that looks at the chars around every digit
+    m = loadDay(3)
+    schematic = m.getSchematic(lines)
+    total = 0
+    for row in range(len(schematic)):
+        for (start, end, num) in m.getNumbers(schematic[row]):
+            if m.isPartNumber(start, end, schematic, row):
+                total += num
+    return total
+
+
+@engine(3, 1, "stream")
+def day03Stream1(lines):
+    return loadDay(3).streamSolve(lines)[0]
+
+
+@engine(3, 2, "stream")
+def day03Stream2(lines):
+    return loadDay(3).streamSolve(lines)[1]
+
+
+@engine(3, 1, "bands")
+def day03Bands1(lines):
+    # tiny bands so generated inputs cross plenty of band edges
+    return loadDay(3).parallelSolve(lines, workers=2, bandRows=3)[0]
+
+
+@engine(3, 2, "bands")
+def day03Bands2(lines):
+    return loadDay(3).parallelSolve(lines, workers=2, bandRows=3)[1]
+
+
+@engine(3, 1, "graph")
+def day03Graph1(lines):
+    return loadDay(3).SchematicGraph.fromSource(lines).partSum()
+
+
+@engine(3, 2, "graph")
+def day03Graph2(lines):
+    return loadDay(3).SchematicGraph.fromSource(lines).ratioSum()
+
+
+@engine(3, 1, "sparse")
+def day03Sparse1(lines):
+    return loadDay(3).SparseSchematic.fromSource(lines).partSum()
+
+
+@engine(3, 2, "sparse")
+def day03Sparse2(lines):
+    return loadDay(3).SparseSchematic.fromSource(lines).ratioSum()
+
+
+def buildByEdits(lines):
+    # starts from a schematic of dots and fills in every cell with EditableSchematic.set, in a shuffled
+    # order so numbers get built up from the middle, joined and split along the way
+    m = loadDay(3)
+    rows = [line.rstrip("\n") for line in lines]
+    schematic = m.EditableSchematic([["."] * len(row) for row in rows])
+    cells = [(r, c) for r in range(len(rows)) for c in range(len(rows[r]))]
+    random.Random(len(cells)).shuffle(cells)
+    for (r, c) in cells:
+        schematic.set(r, c, rows[r][c])
+    return schematic.partTotal, schematic.ratioTotal
+
+
+@engine(3, 1, "editable")
+def day03Editable1(lines):
+    return buildByEdits(lines)[0]
+
+
+@engine(3, 2, "editable")
+def day03Editable2(lines):
+    return buildByEdits(lines)[1]
+
+
+@engine(3, 2, "numberScan")
+def day03NumberScan(lines):
+    # the original gear check that scans the row's numbers for each neighbour of a star
+    m = loadDay(3)
+    schematic = m.getSchematic(lines)
+    numbers = [m.getNumbers(row) for row in schematic]
+    ratios = 0
+    for row in range(len(schematic)):
+        for col in range(len(schematic[row])):
+            if schematic[row][col] == '*':
+                ratios += m.getGearRatio(schematic, row, col, numbers)
+    return ratios
+
+
+@engine(4, 1, "listScan")
+def day04ListScan(lines):
+    # the original rule - every entry of the numbers that is in the winners list is a match
+    total = 0
+    for line in lines:
+        numbers, _, winners = line.partition(":")[2].partition("|")
+        winners = winners.split()
+        matches = 0
+        for num in numbers.split():
+            if num in winners:
+                matches += 1
+        total += 2 ** (matches - 1) if matches else 0
+    return total
+
+
+@engine(4, 2, "simulate")
+def day04Simulate(lines):
+    # the original part 2 that hands out every copy one at a time
+    m = loadDay(4)
+    cards = [m.Card(line) for line in lines]
+    numScratchers = 0
+    cardsToEval = cards.copy()
+    while (cardsToEval):
+        card = cardsToEval.pop()
+        numScratchers += 1
+        for i in range(card.numMatches):
+            cardsToEval.append(cards[card.id + i])
+    return numScratchers
+
+
+@engine(4, 2, "stream")
+def day04Stream(lines):
+    return sum(count for (_, count) in loadDay(4).streamCounts(lines))
+
+
+@engine(5, 2, "ranges")
+def day05Ranges(lines):
+    m = loadDay(5)
+    seeds, maps = m.readInput(lines)
+    seedRanges = [(seeds[i], seeds[i + 1]) for i in range(0, len(seeds) - 1, 2)]
+    return m.getRangeMin(seedRanges, maps)
+
+
+def readRaces(lines):
+    times = [int(i) for i in lines[0].split() if i.isdigit()]
+    distances = [int(i) for i in lines[1].split() if i.isdigit()]
+    return times, distances
+
+
+@engine(6, 1, "closedForm")
+def day06ClosedForm1(lines):
+    m = loadDay(6)
+    product = 1
+    for (t, d) in zip(*readRaces(lines)):
+        product *= m.waysToWin(t, d)
+    return product
+
+
+@engine(6, 2, "closedForm")
+def day06ClosedForm2(lines):
+    times, distances = readRaces(lines)
+    t = int("".join(str(i) for i in times))
+    d = int("".join(str(i) for i in distances))
+    return loadDay(6).waysToWin(t, d)
+
+
+# running
+
+def outcome(func, lines):
+    # ('ok', answer) or ('error', exception type) - errors count as an answer so they get compared too
+    try:
+        return ("ok", func(list(lines)))
+    except RecursionError:
+        return ("error", "RecursionError")
+    except Exception as e:
+        return ("error", type(e).__name__)
+
+
+def minimize(lines, disagrees):
+    # delta debugging over lines - keep dropping chunks of lines while disagrees(lines) stays true
+    chunks = 2
+    while len(lines) >= 2:
+        size = -(-len(lines) // chunks)  # ceil
+        reduced = False
+        for start in range(0, len(lines), size):
+            candidate = lines[:start] + lines[start + size:]
+            if candidate and disagrees(candidate):
+                lines = candidate
+                chunks = max(chunks - 1, 2)
+                reduced = True
+                break
+        if not reduced:
+            if chunks >= len(lines):
+                break
+            chunks = min(chunks * 2, len(lines))
+    return lines
+
+
+def compareEngines(day, part, cases, size, seed):
+    # returns {engine name: {"cases", "mismatches", "time", "speedup", "repro"}} for every engine of (day, part)
+    funcs = engines.get((day, part), {})
+    reference = funcs[REFERENCE]
+    stats = {name: {"cases": 0, "mismatches": 0, "time": 0.0, "speedup": None, "repro": None}
+             for name in funcs}
+    rng = random.Random(seed)
+
+    for _ in range(cases):
+        lines = generators[day](rng, size)
+        start = time.perf_counter()
+        expected = outcome(reference, lines)
+        stats[REFERENCE]["time"] += time.perf_counter() - start
+        stats[REFERENCE]["cases"] += 1
+
+        for name, func in funcs.items():
+            if name == REFERENCE:
+                continue
+            start = time.perf_counter()
+            got = outcome(func, lines)
+            stats[name]["time"] += time.perf_counter() - start
+            stats[name]["cases"] += 1
+            if got == expected:
+                continue
+
+            stats[name]["mismatches"] += 1
+            if stats[name]["repro"] is None:
+                # shrink while it keeps failing the same way (same kinds of outcome, still different)
+                kinds = (expected[0], got[0])
+
+                def disagrees(candidate, func=func):
+                    a, b = outcome(reference, candidate), outcome(func, candidate)
+                    return a != b and (a[0], b[0]) == kinds
+                repro = minimize(lines, disagrees)
+                stats[name]["repro"] = {"input": "".join(repro), "reference": outcome(reference, repro),
+                                        name: outcome(func, repro)}
+
+    for name in funcs:
+        if stats[name]["time"] > 0:
+            stats[name]["speedup"] = stats[REFERENCE]["time"] / stats[name]["time"]
+    return stats
+
+
+def getParser():
+    parser = argparse.ArgumentParser(description="compare the solutions against their faster engines")
+    parser.add_argument("days", nargs="*", type=int, help="days to check (default: every day with a generator)")
+    parser.add_argument("--cases", type=int, default=50, help="generated inputs per day (default: 50)")
+    parser.add_argument("--size", type=int, default=20,
+                        help="rough size of each generated input, in lines (default: 20)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    return parser
+
+
+def main(argv=None):
+    args = getParser().parse_args(argv)
+    registerReferences()
+    days = args.days or sorted(generators)
+    failed = False
+
+    for day in days:
+        if day not in generators:
+            print("no generator for day " + str(day), file=sys.stderr)
+            return 2
+        for part in (1, 2):
+            if (day, part) not in engines:
+                continue
+            stats = compareEngines(day, part, args.cases, args.size, args.seed)
+            for name, s in sorted(stats.items()):
+                speedup = "%.1fx" % s["speedup"] if (name != REFERENCE and s["speedup"]) else "-"
+                print("day %02d part %d  %-15s cases %-5d mismatches %-5d time %8.3fs  speedup %s"
+                      % (day, part, name, s["cases"], s["mismatches"], s["time"], speedup))
+                if s["repro"]:
+                    failed = True
+                    print("    smallest disagreeing input:")
+                    for line in s["repro"]["input"].splitlines():
+                        print("        " + line)
+                    print("    reference: %r\n    %s: %r" % (s["repro"]["reference"], name, s["repro"][name]))
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+"""
+shared input handling for the dayNN.py solutions
+
+every solver takes a 'source' which can be
+    - a path to a file (the default is always dayNN_input.txt in the current directory)
+    - "-" for stdin
+    - an open file, text or binary
+    - any iterable of lines, like a list or a generator
+lines are handed out one at a time as they are read, so a solver that doesnt need the whole input at
+once never holds more than a line of it in memory
+"""
+
+import os
+import sys
+
+
+def readLines(source):
+    # yields the lines of source one at a time, with their line endings left on (like iterating a file)
+    if source == "-":
+        source = sys.stdin
+    if isinstance(source, (str, bytes, os.PathLike)):
+        with open(source) as f:
+            yield from f
+        return
+
+    for line in source:
+        if isinstance(line, (bytes, bytearray)):
+            line = line.decode()
+        yield line
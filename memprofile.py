@@ -0,0 +1,106 @@
+"""
+peak and retained memory of a call, broken down by where the memory was allocated
+
+    answer, report = profile(day04.prob2, "day04_input.txt")
+
+report has
+    peak            most bytes allocated at any point during the call (on top of what was there before)
+    retained        bytes the call allocated that are still alive after it returns
+    peakSites       [(site, bytes), ...] biggest allocation sites around the peak
+    retainedSites   [(site, bytes), ...] biggest allocation sites still alive after the call
+
+uses tracemalloc, so everything runs a few times slower while profiling. tracemalloc cant say what was
+allocated at the exact moment of the peak, so a background thread watches the traced memory and takes a
+snapshot whenever it reaches a new high - peakSites comes from the highest snapshot it caught
+"""
+
+import os
+import threading
+import tracemalloc
+
+import tracing
+
+# allocations made by tracemalloc itself, this file or the span tracer (when --memory and --trace are
+# used together) dont count
+_ignore = [tracemalloc.Filter(False, tracemalloc.__file__),
+           tracemalloc.Filter(False, __file__),
+           tracemalloc.Filter(False, threading.__file__),
+           tracemalloc.Filter(False, tracing.__file__)]
+
+
+class PeakSampler(threading.Thread):
+    # polls the traced memory every 'interval' seconds and keeps a snapshot of the highest point seen
+
+    def __init__(self, interval=0.005):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.highest = 0
+        self.snapshot = None
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        current, _ = tracemalloc.get_traced_memory()
+        # only re-snapshot on a real new high, snapshots are slow
+        if current > self.highest * 1.05:
+            self.highest = current
+            self.snapshot = tracemalloc.take_snapshot()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def formatSite(stat):
+    frame = stat.traceback[0]
+    return "%s:%d" % (os.path.basename(frame.filename), frame.lineno)
+
+
+def topSites(snapshot, before, top):
+    # biggest growth per source line between the two snapshots
+    stats = snapshot.filter_traces(_ignore).compare_to(before, "lineno")
+    stats = [s for s in stats if s.size_diff > 0]
+    stats.sort(key=lambda s: s.size_diff, reverse=True)
+    return [(formatSite(s), s.size_diff) for s in stats[:top]]
+
+
+def profile(func, *args, top=10, interval=0.005, **kwargs):
+    # call func(*args, **kwargs) under tracemalloc, returns (whatever func returns, report)
+    wasTracing = tracemalloc.is_tracing()
+    if not wasTracing:
+        tracemalloc.start()
+
+    before = tracemalloc.take_snapshot().filter_traces(_ignore)
+    baseline, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    sampler = PeakSampler(interval)
+    sampler.start()
+    try:
+        value = func(*args, **kwargs)
+    finally:
+        sampler.stop()
+        # one last look in case the peak was right at the end and the thread never woke up for it
+        sampler.sample()
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        if not wasTracing:
+            tracemalloc.stop()
+
+    report = {
+        "peak": peak - baseline,
+        "retained": max(current - baseline, 0),
+        "peakSites": topSites(sampler.snapshot, before, top) if sampler.snapshot else [],
+        "retainedSites": topSites(after, before, top),
+    }
+    return value, report
+
+
+def formatBytes(n):
+    for unit in ("B", "KB", "MB"):
+        if abs(n) < 1024:
+            return "%d%s" % (n, unit) if unit == "B" else "%.1f%s" % (n, unit)
+        n /= 1024
+    return "%.1fGB" % n
@@ -0,0 +1,211 @@
+"""
+local http service for solving puzzle inputs without starting a python process per request
+
+    python server.py --port 8023 -j 4
+    curl --data-binary @day04_input.txt http://127.0.0.1:8023/solve/4/2
+
+POST /solve/<day>/<part> with the puzzle input as the body, the response is json:
+    {"day": 4, "part": 2, "answer": 30, "wall": ..., "cpu": ..., "cached": false}
+wall and cpu are how long the solver took in the worker. GET /health answers {"ok": true}
+
+the worker processes import every day module when they start and are all started before the server
+begins listening. answers are kept in memory by hash of (day, part, input) so sending the same input
+again answers straight away, and identical requests that arrive while one is being solved wait for it
+instead of solving it twice
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from aoc23 import discoverDays, loadDay
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large", 422: "Unprocessable Entity", 500: "Internal Server Error"}
+
+
+def warmWorker():
+    # runs once in each worker process so requests never pay for imports
+    for day in discoverDays():
+        loadDay(day)
+
+
+def ping():
+    return True
+
+
+def solveInput(day, part, text):
+    # runs in a worker - returns (answer, wall, cpu)
+    solve = getattr(loadDay(day), "prob" + str(part))
+    wallStart = time.perf_counter()
+    cpuStart = time.process_time()
+    answer = solve(text.splitlines(keepends=True))
+    return answer, time.perf_counter() - wallStart, time.process_time() - cpuStart
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class SolveService:
+
+    def __init__(self, workers=None, maxConcurrent=16, cacheSize=1024, maxBody=64 * 1024 * 1024):
+        self.workers = workers or os.cpu_count()
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=warmWorker)
+        self.limit = asyncio.Semaphore(maxConcurrent)
+        self.cacheSize = cacheSize
+        self.maxBody = maxBody
+        self.days = set(discoverDays())
+        self.results = OrderedDict()  # key -> result dict, oldest first
+        self.inFlight = {}  # key -> future for requests currently being solved
+
+    async def warm(self):
+        # submitting one task per worker at once makes the pool start all of its processes now
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(self.pool, ping) for _ in range(self.workers)])
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+    async def solve(self, day, part, body):
+        if day not in self.days or part not in (1, 2):
+            raise HTTPError(404, "no solution for day %d part %d" % (day, part))
+
+        key = hashlib.sha256(b"%d:%d:" % (day, part) + body).hexdigest()
+        if key in self.results:
+            self.results.move_to_end(key)
+            return dict(self.results[key], cached=True)
+        if key in self.inFlight:
+            return dict(await asyncio.shield(self.inFlight[key]), cached=True)
+
+        future = asyncio.get_running_loop().create_future()
+        self.inFlight[key] = future
+        try:
+            async with self.limit:
+                result = await self._run(day, part, body)
+            future.set_result(result)
+        except BaseException as e:
+            future.set_exception(e)
+            # nobody else may be waiting on it, dont let asyncio complain about it going unretrieved
+            future.exception()
+            raise
+        finally:
+            del self.inFlight[key]
+
+        self.results[key] = result
+        if len(self.results) > self.cacheSize:
+            self.results.popitem(last=False)
+        return dict(result, cached=False)
+
+    async def _run(self, day, part, body):
+        try:
+            text = body.decode()
+        except UnicodeDecodeError:
+            raise HTTPError(400, "input is not utf-8 text")
+        loop = asyncio.get_running_loop()
+        try:
+            answer, wall, cpu = await loop.run_in_executor(self.pool, solveInput, day, part, text)
+        except Exception as e:
+            raise HTTPError(422, "solver failed: " + repr(e))
+        return {"day": day, "part": part, "answer": answer, "wall": wall, "cpu": cpu}
+
+    async def handle(self, reader, writer):
+        # one request per connection
+        try:
+            status, payload = await self.respond(reader)
+        except HTTPError as e:
+            status, payload = e.status, {"error": str(e)}
+        except Exception as e:
+            status, payload = 500, {"error": repr(e)}
+
+        body = json.dumps(payload).encode()
+        writer.write(b"HTTP/1.1 %d %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\n"
+                     b"Connection: close\r\n\r\n" % (status, STATUS_TEXT[status].encode(), len(body)))
+        writer.write(body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    async def respond(self, reader):
+        requestLine = (await reader.readline()).decode("latin-1").split()
+        if len(requestLine) != 3:
+            raise HTTPError(400, "bad request line")
+        method, path, _ = requestLine
+
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if path == "/health":
+            return 200, {"ok": True}
+
+        parts = path.strip("/").split("/")
+        if len(parts) != 3 or parts[0] != "solve":
+            raise HTTPError(404, "unknown path " + path)
+        if method != "POST":
+            raise HTTPError(405, "use POST with the puzzle input as the body")
+        try:
+            day, part = int(parts[1]), int(parts[2])
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise HTTPError(400, "day, part and content-length have to be numbers")
+        if length > self.maxBody:
+            raise HTTPError(413, "input is bigger than %d bytes" % self.maxBody)
+
+        body = await reader.readexactly(length)
+        return 200, await self.solve(day, part, body)
+
+
+async def serve(host, port, **options):
+    service = SolveService(**options)
+    await service.warm()
+    server = await asyncio.start_server(service.handle, host, port)
+    print("listening on http://%s:%d" % (host, port), file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def getParser():
+    parser = argparse.ArgumentParser(description="serve the advent of code 2023 solutions over http")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8023, help="port to listen on (default: 8023)")
+    parser.add_argument("-j", "--jobs", type=int, default=0, help="worker processes (default: one per cpu)")
+    parser.add_argument("--max-concurrent", type=int, default=16,
+                        help="requests solved at once, the rest wait their turn (default: 16)")
+    parser.add_argument("--cache-size", type=int, default=1024,
+                        help="answers kept in memory for repeat inputs (default: 1024)")
+    parser.add_argument("--max-body", type=int, default=64 * 1024 * 1024,
+                        help="largest input accepted, in bytes (default: 64MB)")
+    return parser
+
+
+def main(argv=None):
+    args = getParser().parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, workers=args.jobs or None,
+                          maxConcurrent=args.max_concurrent, cacheSize=args.cache_size,
+                          maxBody=args.max_body))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+span tracing for the solutions, exported as chrome trace_event json (open it in chrome://tracing or
+https://ui.perfetto.dev)
+
+    with span("day05.prob2.search"):
+        ...
+
+    @traced("day05.getTransformation")
+    def getTransformation(num, maps):
+        ...
+
+tracing is off unless AOC23_TRACE=1 is set or enable() is called before the day modules are imported.
+while off, span() hands back a shared do-nothing context manager and @traced returns the function
+untouched, so the only cost left is one flag check per span
+"""
+
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+
+enabled = os.environ.get("AOC23_TRACE") == "1"
+
+# hot helpers can be called millions of times, stop recording past this many events
+MAX_EVENTS = int(os.environ.get("AOC23_TRACE_MAX_EVENTS", 1000000))
+
+events = []
+dropped = 0
+
+_noSpan = contextlib.nullcontext()
+
+
+def enable():
+    global enabled
+    enabled = True
+    # so worker processes started after this trace too
+    os.environ["AOC23_TRACE"] = "1"
+
+
+def disable():
+    global enabled
+    enabled = False
+    os.environ.pop("AOC23_TRACE", None)
+
+
+def record(name, start, end):
+    # start and end are time.perf_counter_ns() values
+    global dropped
+    if len(events) >= MAX_EVENTS:
+        dropped += 1
+        return
+    events.append({"name": name, "cat": name.split(".")[0], "ph": "X",
+                   "ts": start / 1000, "dur": (end - start) / 1000,
+                   "pid": os.getpid(), "tid": threading.get_native_id()})
+
+
+class _Span:
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+
+def span(name):
+    if not enabled:
+        return _noSpan
+    return _Span(name)
+
+
+def traced(name):
+    # decorator version of span - only wraps the function if tracing was on when it was defined
+    def decorator(func):
+        if not enabled:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, start, time.perf_counter_ns())
+        return wrapper
+    return decorator
+
+
+def collect():
+    # returns the recorded events and starts over, used to ship events back from worker processes
+    global events, dropped
+    collected = events
+    if dropped:
+        collected.append({"name": "dropped %d events" % dropped, "ph": "i", "s": "p",
+                          "ts": time.perf_counter_ns() / 1000, "pid": os.getpid(),
+                          "tid": threading.get_native_id()})
+    events = []
+    dropped = 0
+    return collected
+
+
+def export(path, traceEvents=None):
+    # write events (default: everything recorded in this process) as a chrome trace file
+    if traceEvents is None:
+        traceEvents = collect()
+    with open(path, "w") as f:
+        json.dump({"traceEvents": traceEvents, "displayTimeUnit": "ms"}, f)